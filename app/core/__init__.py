@@ -9,7 +9,17 @@ from .exceptions import (
     UnauthorizedError,
 )
 from .pagination import BasePaginationParams, BasePaginatedResponse, BaseSortOrder
-from .redis import get_redis, cache_response
+from .redis_pool import get_redis, get_sync_redis, get_redis_pool_stats
+from .redis import (
+    cache_response,
+    get_cache_stats,
+    invalidate_tags,
+    CacheInvalidator,
+    get_cache_invalidator,
+    AsyncCacheInvalidator,
+    get_async_cache_invalidator,
+)
+from .cache_metrics import cache_metrics
 from .logger import logger  # Add this line
 
 __all__ = [
@@ -25,6 +35,15 @@ __all__ = [
     "ForbiddenError",
     "UnauthorizedError",
     "get_redis",
+    "get_sync_redis",
+    "get_redis_pool_stats",
     "cache_response",
+    "get_cache_stats",
+    "invalidate_tags",
+    "CacheInvalidator",
+    "get_cache_invalidator",
+    "AsyncCacheInvalidator",
+    "get_async_cache_invalidator",
+    "cache_metrics",
     "logger",
 ]
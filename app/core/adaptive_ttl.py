@@ -0,0 +1,80 @@
+import threading
+from .config import app_settings
+
+
+def write_stats_key(tag: str) -> str:
+    """Redis hash tracking how often a tag is invalidated."""
+    return f"writes:{tag}"
+
+
+def parse_write_stats(raw: dict) -> dict:
+    """Decode a write stats hash as returned by HGETALL."""
+    return {
+        (key.decode() if isinstance(key, bytes) else key): float(value)
+        for key, value in raw.items()
+    }
+
+
+def record_write(stats: dict, now: float) -> dict:
+    """
+    Fold one more invalidation into a tag's write stats.
+
+    Args:
+        stats: Current stats of the tag (may be empty).
+        now: Time of the invalidation.
+
+    Returns:
+        Mapping to store back: the time of the last write and an
+        exponentially weighted average of the interval between writes.
+    """
+    if "last" not in stats:
+        return {"last": now}
+
+    interval = now - stats["last"]
+    if "interval" in stats:
+        smoothing = app_settings.cache_adaptive_smoothing
+        interval = smoothing * interval + (1 - smoothing) * stats["interval"]
+    return {"last": now, "interval": interval}
+
+
+def choose_ttl(tag_stats: list[dict], now: float, min_ttl: int, max_ttl: int) -> int:
+    """
+    Pick a TTL from the write frequency of an entry's tags.
+    Rows that were never invalidated get `max_ttl`; the more often a tag is
+    invalidated, the closer the TTL gets to `min_ttl`. A quiet period longer
+    than the usual interval counts as the interval, so cooled-down rows earn
+    longer TTLs again.
+    """
+    ttl = max_ttl
+    for stats in tag_stats:
+        if "last" not in stats:
+            continue
+        interval = max(stats.get("interval", 0.0), now - stats["last"])
+        ttl = min(ttl, int(interval * app_settings.cache_adaptive_ttl_fraction))
+    return max(min_ttl, min(ttl, max_ttl))
+
+
+class TtlStats:
+    """TTLs chosen for adaptive routes, keyed by route path."""
+
+    def __init__(self):
+        self._routes: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, ttl: int) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(
+                route, {"count": 0, "total": 0, "min": ttl, "max": ttl, "last": ttl}
+            )
+            stats["count"] += 1
+            stats["total"] += ttl
+            stats["min"] = min(stats["min"], ttl)
+            stats["max"] = max(stats["max"], ttl)
+            stats["last"] = ttl
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                route: {**stats, "avg": stats["total"] / stats["count"]}
+                for route, stats in self._routes.items()
+            }
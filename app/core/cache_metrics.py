@@ -0,0 +1,89 @@
+import bisect
+import threading
+from dataclasses import dataclass, field
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+@dataclass
+class RouteMetrics:
+    """Cache counters and latencies of one route template."""
+
+    hits: int = 0
+    local_hits: int = 0
+    middleware_hits: int = 0  # Answered before dependency resolution
+    misses: int = 0
+    errors: int = 0
+    bypasses: int = 0
+    stale_serves: int = 0
+    bytes_served: int = 0
+    redis_get_latency: Histogram = field(default_factory=Histogram)
+    recompute_latency: Histogram = field(default_factory=Histogram)
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "local_hits": self.local_hits,
+            "middleware_hits": self.middleware_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "bypasses": self.bypasses,
+            "stale_serves": self.stale_serves,
+            "bytes_served": self.bytes_served,
+            "hit_ratio": (
+                self.hits / (self.hits + self.misses)
+                if self.hits + self.misses
+                else None
+            ),
+            "redis_get_latency": self.redis_get_latency.to_dict(),
+            "recompute_latency": self.recompute_latency.to_dict(),
+        }
+
+
+class CacheMetrics:
+    """Per-route cache metrics, keyed by route template (e.g. /todo/{id})."""
+
+    def __init__(self):
+        self._routes: dict[str, RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def route(self, name: str) -> RouteMetrics:
+        with self._lock:
+            if name not in self._routes:
+                self._routes[name] = RouteMetrics()
+            return self._routes[name]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {name: metrics.to_dict() for name, metrics in self._routes.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+cache_metrics = CacheMetrics()
@@ -0,0 +1,118 @@
+from typing import get_origin
+from fastapi import Request
+from fastapi.routing import APIRoute
+from fastapi.security.base import SecurityBase
+from pydantic import BaseModel, ValidationError
+from starlette.routing import Match
+from .redis import LOOKUP_SCOPE_KEY, REVALIDATE_SCOPE_KEY, lookup_request
+
+
+def match_route(scope, routes=None) -> tuple[APIRoute | None, dict]:
+    """
+    The API route a request will be dispatched to, and its child scope.
+    Routers added with `include_router` are searched down to the route that
+    handles the request: recent FastAPI versions keep each included router
+    as a single entry of the app's routes.
+
+    Returns:
+        The route, or the included route with the router's dependencies
+        merged in, and its child scope.
+    """
+    for route in scope["app"].router.routes if routes is None else routes:
+        match, child_scope = route.matches(scope)
+        if match != Match.FULL:
+            continue
+        if isinstance(route, APIRoute):
+            return route, child_scope
+        original_route = getattr(route, "original_route", None)
+        if isinstance(original_route, APIRoute):
+            # A route of an included router, as FastAPI will dispatch it
+            return route, {**child_scope, "route": original_route}
+        included_routes = getattr(route, "effective_route_contexts", None)
+        if included_routes is not None:
+            return match_route(scope, list(included_routes()))
+        return None, {}
+    return None, {}
+
+
+def has_security(dependant) -> bool:
+    """Whether an endpoint depends on a security scheme, at any depth."""
+    return any(
+        isinstance(dependency.call, SecurityBase) or has_security(dependency)
+        for dependency in dependant.dependencies
+    )
+
+
+def parse_query_models(route: APIRoute, request: Request) -> dict | None:
+    """
+    Build the query models an endpoint takes through `Depends()` (e.g.
+    `TodoPaginationParams`) from the query string, so the cache key matches
+    the one the endpoint itself computes.
+
+    Returns:
+        The models by argument name, or None if the query is invalid and the
+        endpoint should answer with its own validation error.
+    """
+    params = {}
+    query = request.query_params
+    for dependency in route.dependant.dependencies:
+        model = dependency.call
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            continue
+        values = {}
+        for name, field in model.model_fields.items():
+            alias = field.alias or name
+            if alias not in query:
+                continue
+            if get_origin(field.annotation) is list:
+                values[name] = query.getlist(alias)
+            else:
+                values[name] = query[alias]
+        try:
+            params[dependency.name] = model.model_validate(values)
+        except ValidationError:
+            return None
+    return params
+
+
+class CacheMiddleware:
+    """
+    Answer fresh cache hits of `cache_response(middleware_hits=True)`
+    endpoints before routing, so a hit resolves no dependencies: no database
+    session, repository or service is created and no request model is
+    validated by FastAPI. Misses, stale entries, uncached routes and routes
+    with security dependencies go through the app as usual; the endpoint
+    continues from the lookup made here instead of repeating it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and not scope.get(REVALIDATE_SCOPE_KEY)
+        ):
+            response = await self.lookup(scope, receive)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    async def lookup(self, scope, receive):
+        route, child_scope = match_route(scope)
+        cached_route = getattr(getattr(route, "endpoint", None), "cached_route", None)
+        if cached_route is None:
+            return None
+        if has_security(route.dependant):
+            return None
+
+        request = Request({**scope, **child_scope}, receive)
+        params = parse_query_models(route, request)
+        if params is None:
+            return None
+        response, lookup = await lookup_request(request, params, cached_route)
+        if lookup is not None:
+            scope[LOOKUP_SCOPE_KEY] = lookup
+        return response
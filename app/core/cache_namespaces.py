@@ -0,0 +1,285 @@
+import asyncio
+import random
+from fastapi import Request
+from redis.exceptions import LockError, RedisError, ResponseError
+from .cache_vary import get_principal
+from .config import app_settings
+from .exceptions import ForbiddenError, NotFoundError, UnauthorizedError
+from .logger import logger
+from .redis import (
+    INVALIDATION_BATCH_SIZE,
+    decode_key,
+    local_cache,
+    namespaces,
+    publish_invalidation,
+)
+
+TRIM_POLICIES = ("lru", "lfu")
+
+# Characters with a meaning in Redis glob-style patterns
+GLOB_CHARACTERS = "\\*?[]"
+
+
+def namespace_pattern(namespace: str) -> str:
+    """
+    SCAN pattern of the entries in a namespace, e.g. "todo:*". Glob
+    characters in the namespace match only themselves.
+    """
+    escaped = "".join(
+        f"\\{char}" if char in GLOB_CHARACTERS else char for char in namespace
+    )
+    return f"{escaped}:*"
+
+
+def known_namespaces() -> set[str]:
+    """Namespaces of the cached routes and of the configured budgets."""
+    return namespaces | set(app_settings.cache_namespace_budgets)
+
+
+def require_cache_admin(request: Request) -> dict:
+    """
+    Dependency guarding cache administration endpoints: the caller's
+    verified token must carry the `cache_admin_role` role.
+
+    Raises:
+        UnauthorizedError: If the caller is anonymous.
+        ForbiddenError: If the caller lacks the role.
+    """
+    principal = get_principal(request)
+    if not principal:
+        raise UnauthorizedError(detail="Not authenticated")
+    if principal.get("role") != app_settings.cache_admin_role:
+        raise ForbiddenError(detail="Not allowed to administer the cache")
+    return principal
+
+
+async def key_memory(redis, key) -> int:
+    """
+    Bytes a key takes in Redis. Falls back to the key and value length where
+    MEMORY USAGE is unavailable (some managed Redis services disable it).
+    """
+    try:
+        usage = await redis.memory_usage(key)
+        if usage is not None:
+            return usage
+    except ResponseError:
+        pass
+    size = await redis.strlen(key)
+    return size + len(key) if size else 0
+
+
+async def sample_namespace(redis, namespace: str, sample_size: int):
+    """
+    Walk a namespace with SCAN, keeping a uniform random sample of its keys.
+
+    Returns:
+        The number of keys in the namespace and the sampled keys.
+    """
+    count, sample = 0, []
+    async for key in redis.scan_iter(
+        match=namespace_pattern(namespace), count=INVALIDATION_BATCH_SIZE
+    ):
+        count += 1
+        if len(sample) < sample_size:
+            sample.append(key)
+        else:
+            # Reservoir sampling
+            index = random.randrange(count)
+            if index < sample_size:
+                sample[index] = key
+    return count, sample
+
+
+async def namespace_memory(redis, namespace: str, sample_size: int) -> dict:
+    """
+    Estimate the memory a namespace uses from the average size of a sample
+    of its keys.
+
+    Args:
+        redis: The Redis client.
+        namespace: The namespace, e.g. "todo".
+        sample_size: Keys to measure with MEMORY USAGE.
+
+    Returns:
+        The key count, the sample size and the estimated bytes, with the
+        namespace's budget if it has one.
+    """
+    count, sample = await sample_namespace(redis, namespace, sample_size)
+    sizes = [await key_memory(redis, key) for key in sample]
+    return {
+        "keys": count,
+        "sampled": len(sizes),
+        "estimated_bytes": int(sum(sizes) / len(sizes) * count) if sizes else 0,
+        "budget_bytes": app_settings.cache_namespace_budgets.get(namespace),
+    }
+
+
+async def get_cache_memory(redis) -> dict:
+    """Memory use of every cached namespace, as in `namespace_memory`."""
+    return {
+        namespace: await namespace_memory(
+            redis, namespace, app_settings.cache_memory_sample_size
+        )
+        for namespace in sorted(known_namespaces())
+    }
+
+
+async def eviction_rank(redis, key, policy: str) -> float | None:
+    """
+    How eagerly to evict a key; higher goes first. "lru" ranks by idle time
+    and "lfu" by the access frequency Redis keeps under an LFU
+    `maxmemory-policy`. Where OBJECT is unavailable, keys closest to
+    expiring go first.
+
+    Returns:
+        The rank, or None if the key expired since it was sampled.
+    """
+    try:
+        if policy == "lfu":
+            freq = await redis.object("freq", key)
+            return None if freq is None else -freq
+        return await redis.object("idletime", key)
+    except ResponseError:
+        ttl = await redis.ttl(key)
+        # -2: the key no longer exists
+        return None if ttl == -2 else -ttl
+
+
+async def evict_keys(redis, keys: list[str]) -> None:
+    """Delete entries from Redis and every worker's local cache."""
+    if not keys:
+        return
+    await redis.unlink(*keys)
+    for key in keys:
+        local_cache.delete(key)
+    await publish_invalidation(redis, *keys)
+
+
+async def trim_namespace(
+    redis,
+    namespace: str,
+    budget: int,
+    sample_size: int,
+    policy: str = "lru",
+    rounds: int = 5,
+) -> list[str]:
+    """
+    Evict entries of a namespace until its estimated memory fits `budget`.
+    Like Redis' own approximated LRU, each round samples keys and evicts the
+    best candidates among them.
+
+    Args:
+        redis: The Redis client.
+        namespace: The namespace to trim.
+        budget: Bytes the namespace may use.
+        sample_size: Keys sampled per round.
+        policy: "lru" or "lfu", see `eviction_rank`.
+        rounds: Sampling rounds before giving up until the next trim.
+
+    Returns:
+        The evicted keys.
+
+    Raises:
+        ValueError: If `policy` is unknown.
+    """
+    if policy not in TRIM_POLICIES:
+        raise ValueError(f"Unknown trim policy {policy!r}")
+
+    evicted = []
+    for _ in range(rounds):
+        count, sample = await sample_namespace(redis, namespace, sample_size)
+        sizes = {key: await key_memory(redis, key) for key in sample}
+        if not sizes:
+            break
+        excess = sum(sizes.values()) / len(sizes) * count - budget
+        if excess <= 0:
+            break
+
+        ranks = {key: await eviction_rank(redis, key, policy) for key in sizes}
+        # Keys that expired since they were sampled are already gone
+        ranks = {key: rank for key, rank in ranks.items() if rank is not None}
+        batch, freed = [], 0
+        for key in sorted(ranks, key=ranks.get, reverse=True):
+            if freed >= excess:
+                break
+            batch.append(decode_key(key))
+            freed += sizes[key]
+        await evict_keys(redis, batch)
+        evicted += batch
+    if evicted:
+        logger.info(f"Trimmed {len(evicted)} entries from cache namespace {namespace}")
+    return evicted
+
+
+async def trim_namespaces(redis) -> dict:
+    """
+    Trim every namespace with a budget in `cache_namespace_budgets`. Only one
+    worker trims a namespace at a time.
+
+    Returns:
+        The number of evicted entries by namespace.
+    """
+    evicted = {}
+    for namespace, budget in app_settings.cache_namespace_budgets.items():
+        lock = redis.lock(
+            f"lock:trim:{namespace}",
+            timeout=app_settings.cache_trim_interval,
+            blocking=False,
+        )
+        if not await lock.acquire():
+            continue
+        try:
+            keys = await trim_namespace(
+                redis,
+                namespace,
+                budget,
+                app_settings.cache_memory_sample_size,
+                app_settings.cache_trim_policy,
+            )
+            evicted[namespace] = len(keys)
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                pass
+    return evicted
+
+
+async def trim_namespaces_periodically(redis) -> None:
+    """Keep namespaces within their budgets, every `cache_trim_interval`."""
+    while True:
+        await asyncio.sleep(app_settings.cache_trim_interval)
+        try:
+            await trim_namespaces(redis)
+        except RedisError as e:
+            logger.warning(f"Cache namespace trimming failed: {e}")
+        except Exception as e:
+            # Keep trimming on the next interval rather than stop for good
+            logger.error(f"Cache namespace trimming failed unexpectedly: {e}")
+
+
+async def flush_namespace(redis, namespace: str) -> int:
+    """
+    Delete every entry of a namespace, one SCAN batch at a time, so Redis is
+    never blocked the way KEYS or FLUSHDB would block it.
+
+    Returns:
+        The number of deleted entries.
+
+    Raises:
+        NotFoundError: If the namespace is not a known cache namespace.
+    """
+    if namespace not in known_namespaces():
+        raise NotFoundError(detail=f"Cache namespace {namespace} not found")
+
+    deleted, batch = 0, []
+    async for key in redis.scan_iter(
+        match=namespace_pattern(namespace), count=INVALIDATION_BATCH_SIZE
+    ):
+        batch.append(decode_key(key))
+        if len(batch) >= INVALIDATION_BATCH_SIZE:
+            await evict_keys(redis, batch)
+            deleted += len(batch)
+            batch = []
+    await evict_keys(redis, batch)
+    return deleted + len(batch)
@@ -0,0 +1,103 @@
+from urllib.parse import urlencode
+import jwt
+from fastapi import Request
+from .config import app_settings
+
+# Parts of a request a cached response can vary on, besides path and query
+VARY_SUBJECT = "subject"
+VARY_ROLE = "role"
+VARY_HEADER_PREFIX = "header:"
+
+
+def validate_vary_on(vary_on: list[str]) -> None:
+    """
+    Check a `cache_response(vary_on=...)` list.
+
+    Raises:
+        ValueError: If an item is not "subject", "role" or "header:<name>".
+    """
+    for item in vary_on:
+        if item in (VARY_SUBJECT, VARY_ROLE):
+            continue
+        if item.startswith(VARY_HEADER_PREFIX) and item[len(VARY_HEADER_PREFIX) :]:
+            continue
+        raise ValueError(
+            f"Cannot vary on {item!r}; use 'subject', 'role' or 'header:<name>'"
+        )
+
+
+def decode_bearer_token(request: Request) -> dict:
+    """Claims of a valid bearer access token, or {} if there is none."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return {}
+    try:
+        return jwt.decode(
+            token,
+            app_settings.jwt_secret_key,
+            algorithms=[app_settings.jwt_algorithm],
+            audience=app_settings.app_audience,
+        )
+    except jwt.InvalidTokenError:
+        return {}
+
+
+def get_principal(request: Request) -> dict:
+    """
+    Claims identifying the caller. Auth dependencies may set
+    `request.state.principal` themselves; otherwise the bearer token is
+    verified and decoded once per request. Keys are only ever derived from
+    verified claims, so a forged token cannot reach another user's entries.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is None:
+        principal = decode_bearer_token(request)
+        request.state.principal = principal
+    return principal
+
+
+def get_subject(request: Request) -> str | None:
+    """Subject of the caller, or None for anonymous callers."""
+    subject = get_principal(request).get("sub")
+    return str(subject) if subject else None
+
+
+def user_namespace(subject: str) -> str:
+    """Key prefix of a user's private entries, hash-tagged onto one node."""
+    return f"user:{{{subject}}}:"
+
+
+def user_keys_key(subject: str) -> str:
+    """Sorted set of a user's private cache keys, by time stored."""
+    return f"user_keys:{{{subject}}}"
+
+
+def vary_cache_key(request: Request, cache_key: str, vary_on: list[str]) -> str:
+    """
+    Partition a cache key by the caller.
+    Varying on "subject" moves the entry into the caller's private namespace;
+    anonymous callers share one entry. Roles and headers stay in the shared
+    namespace, with one entry per value.
+
+    Args:
+        request: The incoming request.
+        cache_key: The key built from the path and query.
+        vary_on: What to vary on, as accepted by `validate_vary_on`.
+
+    Returns:
+        The key to cache the response under.
+    """
+    parts = []
+    for item in vary_on:
+        if item == VARY_ROLE:
+            parts.append((item, str(get_principal(request).get("role", ""))))
+        elif item.startswith(VARY_HEADER_PREFIX):
+            name = item[len(VARY_HEADER_PREFIX) :].lower()
+            parts.append((item.lower(), request.headers.get(name, "")))
+    if parts:
+        cache_key = f"{cache_key}#{urlencode(sorted(parts))}"
+
+    subject = get_subject(request) if VARY_SUBJECT in vary_on else None
+    if subject:
+        cache_key = f"{user_namespace(subject)}{cache_key}"
+    return cache_key
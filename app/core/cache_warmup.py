@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import Counter
+from threading import Lock
+import httpx
+from redis.exceptions import RedisError
+from .config import app_settings
+from .logger import logger
+
+# Sorted set of cache keys by how often workers served them
+HOT_KEYS_KEY = "cache:hot_keys"
+
+
+class HotKeys:
+    """
+    Per-worker count of requests per cache key. Cache keys are request
+    paths with their normalized query, so the hottest ones can be requested
+    again to warm the cache after a restart.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._counts: Counter[str] = Counter()
+        self._lock = Lock()
+
+    def record(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+            # Keep memory bounded by forgetting the long tail
+            if len(self._counts) > 2 * self.max_size:
+                self._counts = Counter(dict(self._counts.most_common(self.max_size)))
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        with self._lock:
+            return self._counts.most_common(n)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+hot_keys = HotKeys(max_size=app_settings.cache_local_max_size)
+
+
+async def save_hot_keys(redis, n: int | None = None) -> None:
+    """
+    Add this worker's hottest cache keys to the shared ranking, so the next
+    startup can warm them.
+
+    Args:
+        redis: The Redis client.
+        n: How many keys to save. Defaults to `cache_warmup_top_n`.
+    """
+    keys = hot_keys.most_common(n or app_settings.cache_warmup_top_n)
+    if not keys:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, count in keys:
+                pipe.zincrby(HOT_KEYS_KEY, count, key)
+            pipe.expire(HOT_KEYS_KEY, app_settings.cache_hot_keys_ttl)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to save hot cache keys: {e}")
+
+
+async def load_hot_keys(redis, n: int) -> list[str]:
+    """Return the `n` cache keys served most before the last shutdown."""
+    if n <= 0:
+        return []
+    try:
+        keys = await redis.zrevrange(HOT_KEYS_KEY, 0, n - 1)
+    except RedisError as e:
+        logger.warning(f"Failed to load hot cache keys: {e}")
+        return []
+    return [key.decode() if isinstance(key, bytes) else key for key in keys]
+
+
+async def warm_cache(
+    app,
+    paths: list[str],
+    timeout: float,
+    concurrency: int,
+) -> dict:
+    """
+    Fill the cache by requesting `paths` from the app in-process, the same
+    way a client would, so every cached endpoint stores its own entry.
+
+    Args:
+        app: The ASGI application.
+        paths: Paths to request, with their query string.
+        timeout: Seconds to spend in total; requests still running are
+            cancelled.
+        concurrency: Requests in flight at once.
+
+    Returns:
+        How many paths were warmed, failed or cut off, and how long it took.
+    """
+    paths = list(dict.fromkeys(paths))
+    result = {"warmed": 0, "failed": 0, "cancelled": 0, "seconds": 0.0}
+    if not paths:
+        return result
+
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://cache-warmup"
+    ) as client:
+
+        async def warm(path: str) -> bool:
+            async with semaphore:
+                try:
+                    response = await client.get(path)
+                except Exception as e:
+                    logger.warning(f"Cache warm-up of {path} failed: {e}")
+                    return False
+                return response.status_code < 500
+
+        tasks = [asyncio.create_task(warm(path)) for path in paths]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    result["warmed"] = sum(1 for task in done if task.result())
+    result["failed"] = len(done) - result["warmed"]
+    result["cancelled"] = len(pending)
+    result["seconds"] = time.perf_counter() - started
+    logger.info(f"Cache warm-up: {result}")
+    return result
+
+
+async def warm_cache_on_startup(app, redis) -> dict:
+    """
+    Warm the configured `cache_warmup_paths` and the `cache_warmup_top_n`
+    keys saved at the last shutdown, within `cache_warmup_timeout` seconds.
+    """
+    paths = list(app_settings.cache_warmup_paths)
+    paths += await load_hot_keys(redis, app_settings.cache_warmup_top_n)
+    return await warm_cache(
+        app,
+        paths,
+        timeout=app_settings.cache_warmup_timeout,
+        concurrency=app_settings.cache_warmup_concurrency,
+    )
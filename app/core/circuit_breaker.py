@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+from .logger import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency (Redis) after repeated failures.
+
+    Closed: calls go through; `failure_threshold` consecutive failures open it.
+    Open: calls are skipped. A background probe pings the dependency every
+        `reset_timeout` seconds and closes the breaker once it answers.
+    Half-open: without a running probe (e.g. only sync callers), a call is let
+        through after `reset_timeout`; success closes, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.times_opened = 0
+        self.opened_at = 0.0
+        self._probe: asyncio.Task | None = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call to the dependency should be attempted."""
+        with self._lock:
+            if self.state == OPEN and self._probe is None:
+                if time.monotonic() - self.opened_at >= self.reset_timeout:
+                    self.state = HALF_OPEN
+            return self.state != OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit breaker {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self, client=None) -> None:
+        """
+        Count a failed call. Pass the async client to probe it for recovery
+        in the background once the breaker opens.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == OPEN or (
+                self.state == CLOSED and self.failures < self.failure_threshold
+            ):
+                return
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning(f"Circuit breaker {self.name} opened")
+
+        if client is not None and self._probe is None:
+            self._probe = asyncio.get_running_loop().create_task(self.probe(client))
+
+    async def probe(self, client) -> None:
+        """Ping the dependency until it answers, then close the breaker."""
+        try:
+            while True:
+                await asyncio.sleep(self.reset_timeout)
+                try:
+                    await client.ping()
+                except Exception:
+                    continue
+                self.record_success()
+                return
+        finally:
+            self._probe = None
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "times_opened": self.times_opened,
+        }
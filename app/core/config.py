@@ -15,10 +15,55 @@ class AppSettings(BaseModel):
     db_pass: str = "postgres"  # Match POSTGRES_PASSWORD
     db_name: str = "postgres"  # Match POSTGRES_DB
     database_url: Optional[str] = None
+    async_database_url: Optional[str] = None  # Defaults to database_url on asyncpg
+    db_pool_mode: str = "queue"  # "queue", or "null" behind pgbouncer (transaction)
+    db_pool_size: int = 10  # Connections kept open, per engine and worker
+    db_max_overflow: int = 20  # Extra connections opened under load
+    db_pool_timeout: float = 30.0  # Seconds to wait for a connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    db_pool_pre_ping: bool = True  # Test connections before handing them out
 
     # Redis settings
     redis_host: str = "redis"  # Changed from localhost to redis for Docker
     redis_port: int = 6379
+    # "host:port" of each cache node; keys are spread over them by consistent
+    # hashing. Empty means the single redis_host/redis_port node.
+    redis_nodes: list[str] = []
+    redis_socket_timeout: float = 0.25  # Keep the cache path from hanging
+    redis_socket_connect_timeout: float = 0.25
+    redis_max_connections: int = 50  # Per client, per worker
+    redis_health_check_interval: int = 30  # Seconds idle before a PING check
+    redis_retry_on_timeout: bool = True
+    redis_retries: int = 1
+    redis_breaker_failure_threshold: int = 5  # Consecutive failures to open
+    redis_breaker_reset_timeout: float = 5.0  # Seconds between recovery probes
+
+    # Cache settings
+    cache_local_max_size: int = 1024  # Entries kept per worker
+    cache_local_ttl: float = 5.0  # Seconds an entry lives in the worker cache
+    cache_invalidation_channel: str = "cache:invalidate"
+    cache_compression_threshold: int = 1024  # Gzip entries from this many bytes
+    cache_compression_level: int = 6
+    cache_executor_workers: int = 40  # Threads running cached sync handlers
+    cache_adaptive_min_ttl: int = 5
+    cache_adaptive_max_ttl: int = 3600
+    cache_adaptive_ttl_fraction: float = 0.5  # Share of the write interval
+    cache_adaptive_smoothing: float = 0.3  # Weight of the latest write interval
+    cache_write_stats_ttl: int = 86400  # Seconds to remember a tag's writes
+    # Paths requested at startup to fill the cache, e.g. "/todo/all"
+    cache_warmup_paths: list[str] = ["/todo/all", "/todo/paginated"]
+    cache_warmup_top_n: int = 50  # Hottest keys of the last run to warm too
+    cache_warmup_timeout: float = 10.0  # Seconds startup may spend warming
+    cache_warmup_concurrency: int = 8
+    cache_hot_keys_ttl: int = 86400  # Seconds to remember the hottest keys
+    cache_user_key_budget: int = 100  # Private entries kept per user
+    # Bytes each namespace may use in Redis, e.g. {"todo": 50_000_000}
+    cache_namespace_budgets: dict[str, int] = {}
+    cache_memory_sample_size: int = 200  # Keys measured per namespace
+    cache_trim_policy: str = "lru"  # "lru" or "lfu"
+    cache_trim_interval: float = 60.0  # Seconds between budget checks
+    # Role claim required to flush cache namespaces
+    cache_admin_role: str = "admin"
 
     # API settings
     api_port: int = 8000
@@ -38,6 +83,10 @@ class AppSettings(BaseModel):
                 f"postgresql://{self.db_user}:{self.db_pass}@"
                 f"{self.db_host}:{self.db_port}/{self.db_name}"
             )
+        if not self.async_database_url:
+            self.async_database_url = self.database_url.replace(
+                "postgresql://", "postgresql+asyncpg://", 1
+            )
 
 
 app_settings = AppSettings()
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache tier."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class LocalCache:
+    """
+    Per-worker LRU cache that sits in front of Redis.
+    Entries are bounded by `max_size` and expire after `ttl` seconds.
+    Safe to use from the event loop and from threadpool handlers.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, object]:
+        """
+        Get an entry and mark it as recently used.
+
+        Returns:
+            Tuple of whether the key was found and its value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return True, value
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        """
+        Store an entry, evicting the least recently used ones over `max_size`.
+        The entry never lives longer than the cache-wide `ttl`.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: str) -> int:
+        """
+        Drop entries, e.g. after another worker announced an invalidation.
+
+        Returns:
+            Number of entries that were dropped.
+        """
+        deleted = 0
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    deleted += 1
+            self.stats.evictions += deleted
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,16 +1,147 @@
+from dataclasses import dataclass, asdict
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import gzip
+import hashlib
 import json
-from fastapi import Request
+import math
+import random
+import time
+import uuid
+from urllib.parse import urlencode
+from fastapi import HTTPException, Request, Response
 from datetime import datetime
+from pydantic import BaseModel, TypeAdapter
+from redis.exceptions import LockError, RedisError
 from sqlalchemy import inspect
 from inspect import iscoroutinefunction
+from .adaptive_ttl import (
+    TtlStats,
+    choose_ttl,
+    parse_write_stats,
+    record_write,
+    write_stats_key,
+)
+from .cache_metrics import cache_metrics
+from .cache_vary import (
+    VARY_SUBJECT,
+    get_subject,
+    user_keys_key,
+    validate_vary_on,
+    vary_cache_key,
+)
+from .cache_warmup import hot_keys
+from .circuit_breaker import CircuitBreaker
+from .config import app_settings
+from .redis_pool import get_redis, get_redis_pool_stats, get_sync_redis
+from .local_cache import CacheStats, LocalCache
+from .logger import logger
 
+# Identifies this worker on the invalidation channel
+WORKER_ID = uuid.uuid4().hex
 
-# Function to get Redis connection (replace with your actual Redis setup)
-async def get_redis():
-    from app.main import app
+# Per-worker tier in front of Redis, used by `cache_response(local=True)`
+local_cache = LocalCache(
+    max_size=app_settings.cache_local_max_size, ttl=app_settings.cache_local_ttl
+)
+redis_stats = CacheStats()
 
-    return app.state.redis
+# Skips Redis on the cache path while it is failing
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=app_settings.redis_breaker_failure_threshold,
+    reset_timeout=app_settings.redis_breaker_reset_timeout,
+)
+
+
+@dataclass
+class CompressionStats:
+    """Sizes of compressed cache entries, to help size Redis."""
+
+    entries: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "bytes_saved": self.raw_bytes - self.stored_bytes,
+            "ratio": self.stored_bytes / self.raw_bytes if self.raw_bytes else None,
+        }
+
+
+compression_stats = CompressionStats()
+
+
+@dataclass
+class ExecutorStats:
+    """Time sync handlers spent queued for a slot in `handler_executor`."""
+
+    tasks: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.tasks += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "max_workers": app_settings.cache_executor_workers,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.tasks if self.tasks else None
+            ),
+        }
+
+
+executor_stats = ExecutorStats()
+ttl_stats = TtlStats()
+
+# Bounded pool running sync handlers wrapped by `cache_response`. Shared by
+# every lifespan in the process, so it is never shut down.
+handler_executor = ThreadPoolExecutor(
+    max_workers=app_settings.cache_executor_workers,
+    thread_name_prefix="cache-handler",
+)
+
+# Response model adapters, keyed by response model
+response_adapters: dict = {}
+
+# Keeps references to running stale-while-revalidate refreshes
+background_refreshes: set[asyncio.Task] = set()
+
+# Scope key marking the in-process request that refreshes a stale entry
+REVALIDATE_SCOPE_KEY = "cache_revalidate"
+
+# Scope key of the `CacheLookup` made by `CacheMiddleware`
+LOOKUP_SCOPE_KEY = "cache_lookup"
+
+# Scope keys a background refresh copies from the request that triggered it
+REFRESH_SCOPE_KEYS = (
+    "type",
+    "asgi",
+    "http_version",
+    "method",
+    "scheme",
+    "server",
+    "client",
+    "root_path",
+    "path",
+    "raw_path",
+    "query_string",
+    "headers",
+)
+
+
+# Namespaces of the cached routes, for memory accounting
+namespaces: set[str] = set()
+
+# Number of keys deleted per command when invalidating a tag
+INVALIDATION_BATCH_SIZE = 500
 
 
 def serialize_sqlalchemy(obj):
@@ -40,35 +171,1023 @@ class ResponseEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+@dataclass
+class CacheEntry:
+    """
+    A fully rendered response as stored in the cache.
+    `expires_at` marks when it stops being fresh; the Redis TTL may outlive it
+    so the entry can still be served stale.
+    """
+
+    body: bytes
+    status_code: int
+    media_type: str
+    expires_at: float
+    encoding: str | None = None
+    etag: str | None = None
+    # Seconds the endpoint took to compute this entry
+    delta: float = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def successful(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def expires_early(self, beta: float) -> bool:
+        """
+        Probabilistic early expiration (XFetch): the closer the entry is to
+        expiring and the longer it took to compute, the likelier a request
+        refreshes it ahead of time, spreading refreshes of hot keys out.
+        """
+        return time.time() - self.delta * beta * math.log(random.random()) >= (
+            self.expires_at
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a one-line JSON header followed by the raw body."""
+        header = json.dumps(
+            {
+                "status_code": self.status_code,
+                "media_type": self.media_type,
+                "expires_at": self.expires_at,
+                "encoding": self.encoding,
+                "etag": self.etag,
+                "delta": self.delta,
+            }
+        )
+        return header.encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, cached: bytes) -> "CacheEntry":
+        header, _, body = cached.partition(b"\n")
+        return cls(body=body, **json.loads(header))
+
+    def compress(self, threshold: int, level: int) -> None:
+        """Gzip the body in place if it is at least `threshold` bytes."""
+        if self.encoding is not None or len(self.body) < threshold:
+            return
+        raw_size = len(self.body)
+        self.body = gzip.compress(self.body, compresslevel=level)
+        self.encoding = "gzip"
+        compression_stats.entries += 1
+        compression_stats.raw_bytes += raw_size
+        compression_stats.stored_bytes += len(self.body)
+
+    def to_response(self, request: Request) -> Response:
+        """
+        Build the response for a request. Compressed bodies are sent as they
+        are to clients that accept gzip and inflated for everyone else.
+        Clients already holding the current ETag get a bodiless 304; as
+        RFC 9110 requires, only successful responses are validated.
+        """
+        headers = {}
+        send_encoded = self.encoding is not None and accepts_encoding(
+            request, self.encoding
+        )
+        if self.encoding is not None:
+            headers["Vary"] = "Accept-Encoding"
+        if send_encoded:
+            headers["Content-Encoding"] = self.encoding
+        if self.etag is not None and self.successful:
+            # Each content coding is a distinct representation
+            headers["ETag"] = (
+                f'"{self.etag}-{self.encoding}"' if send_encoded else f'"{self.etag}"'
+            )
+            if etag_matches(request, self.etag):
+                headers.pop("Content-Encoding", None)
+                return Response(status_code=304, headers=headers)
+
+        body = self.body
+        if self.encoding is not None and not send_encoded:
+            body = gzip.decompress(body)
+        return Response(
+            content=body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers=headers,
+        )
+
+
+def compute_etag(body: bytes, status_code: int = 200) -> str | None:
+    """
+    Strong ETag derived from the uncompressed response body, or None for
+    unsuccessful responses, which conditional requests do not apply to.
+    """
+    if not 200 <= status_code < 300:
+        return None
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names any representation of the given ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    for value in if_none_match.split(","):
+        value = value.strip()
+        if value == "*":
+            return True
+        # If-None-Match uses weak comparison
+        value = value.removeprefix("W/").strip('"')
+        if value == etag or value.startswith(f"{etag}-"):
+            return True
+    return False
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """Whether the client's Accept-Encoding allows the given encoding."""
+    for value in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = value.strip().partition(";")
+        if name.strip().lower() in (encoding, "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def get_cache_stats() -> dict:
+    """Hit, miss and eviction counters for each cache tier."""
+    return {
+        "local": {**local_cache.stats.to_dict(), "size": len(local_cache)},
+        "redis": redis_stats.to_dict(),
+        "compression": compression_stats.to_dict(),
+        "executor": executor_stats.to_dict(),
+        "adaptive_ttl": ttl_stats.to_dict(),
+        "routes": cache_metrics.to_dict(),
+        "circuit_breaker": redis_breaker.to_dict(),
+        "pools": get_redis_pool_stats(),
+    }
+
+
+async def publish_invalidation(redis, *keys: str) -> None:
+    """Tell every other worker to drop its local copy of the given keys."""
+    if keys:
+        await redis.publish(
+            app_settings.cache_invalidation_channel,
+            json.dumps({"origin": WORKER_ID, "keys": list(keys)}),
+        )
+
+
+async def listen_for_invalidations(redis) -> None:
+    """
+    Evict local entries announced on the invalidation channel.
+    Runs for the lifetime of the worker; started on application startup.
+    Reconnects after Redis errors, dropping the local tier since
+    invalidations may have been missed in the meantime.
+    """
+    while True:
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(app_settings.cache_invalidation_channel)
+            while True:
+                # Poll with a timeout so the socket timeout never fires
+                message = await pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    logger.warning(f"Ignoring invalid cache invalidation: {message}")
+                    continue
+                if payload.get("origin") != WORKER_ID:
+                    local_cache.delete(*payload.get("keys", []))
+        except RedisError as e:
+            logger.warning(f"Cache invalidation listener disconnected: {e}")
+            local_cache.clear()
+            await asyncio.sleep(app_settings.redis_breaker_reset_timeout)
+        finally:
+            try:
+                await pubsub.aclose()
+            except RedisError:
+                pass
+
+
+def decode_key(key: bytes | str) -> str:
+    """Cache clients return raw bytes; keys are handled as strings."""
+    return key.decode() if isinstance(key, bytes) else key
+
+
+def tag_key(tag: str) -> str:
+    """Redis set holding every cache key stored under a tag."""
+    return f"tag:{tag}"
+
+
+async def invalidate_tags(redis, *tags: str) -> int:
+    """
+    Delete every cache entry stored under the given tags.
+    Walks each tag set with SSCAN rather than scanning the keyspace.
+
+    Returns:
+        Number of cache keys that were invalidated.
+    """
+    keys = set()
+    for tag in tags:
+        async for key in redis.sscan_iter(tag_key(tag), count=INVALIDATION_BATCH_SIZE):
+            keys.add(decode_key(key))
+
+    keys = list(keys)
+    for start in range(0, len(keys), INVALIDATION_BATCH_SIZE):
+        await redis.unlink(*keys[start : start + INVALIDATION_BATCH_SIZE])
+    if tags:
+        await redis.unlink(*(tag_key(tag) for tag in tags))
+
+    redis_stats.evictions += len(keys)
+    local_cache.delete(*keys)
+    await publish_invalidation(redis, *keys)
+    await record_tag_writes(redis, tags)
+    return len(keys)
+
+
+async def record_tag_writes(redis, tags) -> None:
+    """Track how often each tag is invalidated, for adaptive TTLs."""
+    if not tags:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.hgetall(write_stats_key(tag))
+        current = await pipe.execute()
+
+    now = time.time()
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag, stats in zip(tags, current):
+            pipe.hset(
+                write_stats_key(tag),
+                mapping=record_write(parse_write_stats(stats), now),
+            )
+            pipe.expire(write_stats_key(tag), app_settings.cache_write_stats_ttl)
+        await pipe.execute()
+
+
+async def get_adaptive_ttl(redis, tags: list[str], min_ttl: int, max_ttl: int):
+    """Pick an entry's TTL from how often its tags were invalidated."""
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.hgetall(write_stats_key(tag))
+        tag_stats = await pipe.execute()
+    return choose_ttl(
+        [parse_write_stats(stats) for stats in tag_stats],
+        time.time(),
+        min_ttl,
+        max_ttl,
+    )
+
+
+class CacheInvalidator:
+    """
+    Invalidates cache tags from synchronous code, e.g. services called by
+    sync routes. Mirrors `invalidate_tags` on a synchronous Redis client.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Delete every cache entry stored under the given tags.
+        Redis failures are logged rather than raised, so a write that already
+        reached the database still succeeds while Redis is down.
+
+        Returns:
+            Number of cache keys that were invalidated.
+        """
+        if not redis_breaker.allow():
+            return 0
+        try:
+            invalidated = self._invalidate(tags)
+        except RedisError as e:
+            redis_breaker.record_failure()
+            logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+            return 0
+        redis_breaker.record_success()
+        return invalidated
+
+    def _invalidate(self, tags) -> int:
+        keys = set()
+        for tag in tags:
+            keys.update(
+                decode_key(key)
+                for key in self.redis.sscan_iter(
+                    tag_key(tag), count=INVALIDATION_BATCH_SIZE
+                )
+            )
+
+        keys = list(keys)
+        for start in range(0, len(keys), INVALIDATION_BATCH_SIZE):
+            self.redis.unlink(*keys[start : start + INVALIDATION_BATCH_SIZE])
+        if tags:
+            self.redis.unlink(*(tag_key(tag) for tag in tags))
+
+        redis_stats.evictions += len(keys)
+        local_cache.delete(*keys)
+        if keys:
+            self.redis.publish(
+                app_settings.cache_invalidation_channel,
+                json.dumps({"origin": WORKER_ID, "keys": keys}),
+            )
+        self.record_writes(tags)
+        return len(keys)
+
+    def record_writes(self, tags) -> None:
+        """Track how often each tag is invalidated, for adaptive TTLs."""
+        if not tags:
+            return
+        with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.hgetall(write_stats_key(tag))
+            current = pipe.execute()
+
+        now = time.time()
+        with self.redis.pipeline(transaction=False) as pipe:
+            for tag, stats in zip(tags, current):
+                pipe.hset(
+                    write_stats_key(tag),
+                    mapping=record_write(parse_write_stats(stats), now),
+                )
+                pipe.expire(write_stats_key(tag), app_settings.cache_write_stats_ttl)
+            pipe.execute()
+
+
+def get_cache_invalidator() -> CacheInvalidator:
+    """Dependency providing a `CacheInvalidator` for services."""
+    return CacheInvalidator(get_sync_redis())
+
+
+class AsyncCacheInvalidator:
+    """
+    Invalidates cache tags from async services, on the async Redis client.
+    Failures are handled like in `CacheInvalidator`.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def invalidate(self, *tags: str) -> int:
+        """
+        Delete every cache entry stored under the given tags.
+
+        Returns:
+            Number of cache keys that were invalidated.
+        """
+        if not redis_breaker.allow():
+            return 0
+        try:
+            invalidated = await invalidate_tags(self.redis, *tags)
+        except RedisError as e:
+            redis_breaker.record_failure(self.redis)
+            logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+            return 0
+        redis_breaker.record_success()
+        return invalidated
+
+
+async def get_async_cache_invalidator() -> AsyncCacheInvalidator:
+    """Dependency providing an `AsyncCacheInvalidator` for async services."""
+    return AsyncCacheInvalidator(await get_redis())
+
+
+async def store_entry(
+    redis, cache_key: str, entry: CacheEntry, ttl: int, tags: list[str]
+) -> None:
+    """Store a cache entry and index it under its tags in one round trip."""
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(cache_key, entry.to_bytes(), ttl)
+        for tag in tags:
+            pipe.sadd(tag_key(tag), cache_key)
+            # Keep the index alive at least as long as its longest entry
+            pipe.expire(tag_key(tag), ttl, nx=True)
+            pipe.expire(tag_key(tag), ttl, gt=True)
+        await pipe.execute()
+
+
+async def track_user_key(
+    redis, subject: str, cache_key: str, ttl: int, budget: int
+) -> list[str]:
+    """
+    Record a user's private entry and evict their oldest entries past
+    `budget`, so no single user can fill the cache.
+
+    Returns:
+        The evicted keys.
+    """
+    keys_key = user_keys_key(subject)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zadd(keys_key, {cache_key: time.time()})
+        pipe.zcard(keys_key)
+        pipe.expire(keys_key, ttl, nx=True)
+        pipe.expire(keys_key, ttl, gt=True)
+        _, count, *_ = await pipe.execute()
+    if count <= budget:
+        return []
+
+    evicted = [
+        decode_key(key) for key, _ in await redis.zpopmin(keys_key, count - budget)
+    ]
+    if evicted:
+        await redis.unlink(*evicted)
+        for key in evicted:
+            local_cache.delete(key)
+        await publish_invalidation(redis, *evicted)
+    return evicted
+
+
+def build_cache_key(request: Request, params: dict | None = None) -> str:
+    """
+    Build the cache key for a request from its path and query parameters.
+    Query models the endpoint received (e.g. `BasePaginationParams`) replace
+    their raw query values with their validated, non-default values, so
+    equivalent requests share one key regardless of parameter order,
+    spelling or explicitly passed defaults.
+
+    Args:
+        request: The incoming request.
+        params: The arguments FastAPI resolved for the endpoint.
+
+    Returns:
+        The path followed by the sorted, normalized query string.
+    """
+    models = [
+        value for value in (params or {}).values() if isinstance(value, BaseModel)
+    ]
+    model_fields = {name for model in models for name in type(model).model_fields}
+
+    query = [
+        (name, value)
+        for name, value in request.query_params.multi_items()
+        if name not in model_fields
+    ]
+    for model in models:
+        values = model.model_dump(mode="json", exclude_defaults=True)
+        for name, value in values.items():
+            for item in value if isinstance(value, list) else [value]:
+                query.append(
+                    (name, item if isinstance(item, str) else json.dumps(item))
+                )
+
+    cache_key = f"{request.url.path}"
+    if query:
+        cache_key = f"{cache_key}?{urlencode(sorted(query))}"
+    return cache_key
+
+
+def request_cache_key(
+    request: Request,
+    params: dict | None,
+    vary_on: list[str] | None,
+    namespace: str | None = None,
+) -> str:
+    """
+    The key a request is cached under, partitioned by `vary_on` and
+    prefixed with its module's namespace, e.g. "todo:/todo/1".
+    """
+    cache_key = build_cache_key(request, params)
+    if vary_on:
+        cache_key = vary_cache_key(request, cache_key, vary_on)
+    else:
+        # Only shared keys can be requested again to warm the cache
+        hot_keys.record(cache_key)
+    if namespace:
+        cache_key = f"{namespace}:{cache_key}"
+    return cache_key
+
+
+async def find_entry(
+    redis,
+    cache_key: str,
+    metrics,
+    local: bool,
+    early_refresh: bool,
+    early_refresh_beta: float,
+) -> tuple[CacheEntry | None, bool]:
+    """
+    Look an entry up in the worker cache, then in Redis, counting hits.
+
+    Returns:
+        The entry, if there is one, and whether it is fresh enough to serve
+        as a hit. Entries picked for early refresh are not.
+    """
+    if local:
+        found, entry = local_cache.get(cache_key)
+        if found:
+            metrics.hits += 1
+            metrics.local_hits += 1
+            metrics.bytes_served += len(entry.body)
+            return entry, True
+
+    started = time.perf_counter()
+    cached = await redis.get(cache_key)
+    metrics.redis_get_latency.observe(time.perf_counter() - started)
+    if not cached:
+        return None, False
+
+    entry = CacheEntry.from_bytes(cached)
+    remaining = entry.expires_at - time.time()
+    if remaining <= 0 or (early_refresh and entry.expires_early(early_refresh_beta)):
+        return entry, False
+    redis_stats.hits += 1
+    metrics.hits += 1
+    metrics.bytes_served += len(entry.body)
+    if local:
+        local_cache.set(cache_key, entry, remaining)
+    return entry, True
+
+
+@dataclass
+class CachedRoute:
+    """Settings `CacheMiddleware` needs to answer hits of a cached endpoint."""
+
+    local: bool
+    vary_on: list[str]
+    early_refresh: bool
+    early_refresh_beta: float
+    namespace: str | None = None
+
+
+@dataclass
+class CacheLookup:
+    """
+    Result of the lookup `CacheMiddleware` made for a request that reaches
+    the endpoint, so the endpoint does not look the entry up again.
+    """
+
+    cache_key: str
+    entry: CacheEntry | None = None
+    # Redis failed during the lookup; the endpoint serves uncached
+    failed: bool = False
+
+
+async def lookup_request(
+    request: Request, params: dict, cached_route: CachedRoute
+) -> tuple[Response | None, CacheLookup | None]:
+    """
+    Look a request up in the cache before its endpoint's dependencies are
+    resolved.
+
+    Args:
+        request: The incoming request, with its route matched.
+        params: Query models of the endpoint, parsed from the request.
+        cached_route: How the endpoint is cached.
+
+    Returns:
+        The cached response if there is a fresh entry. Otherwise the lookup,
+        for the endpoint to continue from, or None while the circuit breaker
+        is open.
+    """
+    if not redis_breaker.allow():
+        return None, None
+    metrics = cache_metrics.route(route_template(request))
+    cache_key = request_cache_key(
+        request, params, cached_route.vary_on, cached_route.namespace
+    )
+    redis = await get_redis()
+    try:
+        entry, fresh = await find_entry(
+            redis,
+            cache_key,
+            metrics,
+            cached_route.local,
+            cached_route.early_refresh,
+            cached_route.early_refresh_beta,
+        )
+    except RedisError as e:
+        redis_breaker.record_failure(redis)
+        metrics.errors += 1
+        logger.warning(f"Cache unavailable, serving uncached: {e}")
+        return None, CacheLookup(cache_key, failed=True)
+    if not fresh:
+        return None, CacheLookup(cache_key, entry)
+    redis_breaker.record_success()
+    metrics.middleware_hits += 1
+    return entry.to_response(request), None
+
+
+def route_template(request: Request) -> str:
+    """Path template of the matched route, e.g. /todo/{id}, for metrics."""
+    return getattr(request.scope.get("route"), "path", request.url.path)
+
+
+def get_response_adapter(route) -> TypeAdapter | None:
+    """TypeAdapter for a route's response model, built once per model."""
+    response_model = getattr(route, "response_model", None)
+    if response_model is None:
+        return None
+    if response_model not in response_adapters:
+        response_adapters[response_model] = TypeAdapter(response_model)
+    return response_adapters[response_model]
+
+
+def render_response(request: Request, response, expiry: int) -> CacheEntry:
+    """
+    Render an endpoint's return value into the bytes FastAPI would send.
+    Validates against the route's `response_model` and dumps with pydantic's
+    native JSON serializer, honouring the route's `response_model_*`
+    options, so hits can skip validation entirely.
+    """
+    expires_at = time.time() + expiry
+    if isinstance(response, Response):
+        body = bytes(response.body)
+        return CacheEntry(
+            body=body,
+            status_code=response.status_code,
+            media_type=response.media_type or "application/json",
+            expires_at=expires_at,
+            etag=compute_etag(body, response.status_code),
+        )
+
+    route = request.scope.get("route")
+    adapter = get_response_adapter(route)
+    if adapter is not None:
+        body = adapter.dump_json(
+            adapter.validate_python(response, from_attributes=True),
+            include=route.response_model_include,
+            exclude=route.response_model_exclude,
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+            exclude_defaults=route.response_model_exclude_defaults,
+            exclude_none=route.response_model_exclude_none,
+        )
+    else:
+        body = json.dumps(response, cls=ResponseEncoder).encode()
+
+    status_code = getattr(route, "status_code", None) or 200
+    return CacheEntry(
+        body=body,
+        status_code=status_code,
+        media_type="application/json",
+        expires_at=expires_at,
+        etag=compute_etag(body, status_code),
+    )
+
+
+def render_exception(exc: HTTPException, expiry: int) -> CacheEntry:
+    """Render an HTTP error the way FastAPI's default handler would."""
+    body = json.dumps({"detail": exc.detail}).encode()
+    return CacheEntry(
+        body=body,
+        status_code=exc.status_code,
+        media_type="application/json",
+        expires_at=time.time() + expiry,
+        etag=compute_etag(body, exc.status_code),
+    )
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """
+    Run a sync handler on `handler_executor` so its blocking work (e.g. ORM
+    queries) stays off the event loop, recording how long it queued.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    submitted = time.perf_counter()
+
+    def run():
+        executor_stats.record_wait(time.perf_counter() - submitted)
+        return context.run(func, *args, **kwargs)
+
+    return await loop.run_in_executor(handler_executor, run)
+
+
+async def wait_for_entry(
+    redis, cache_key: str, timeout: float, interval: float
+) -> CacheEntry | None:
+    """
+    Poll for a fresh entry while another caller recomputes it.
+
+    Returns:
+        The fresh cache entry, or None if nothing arrived within the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        cached = await redis.get(cache_key)
+        if cached:
+            entry = CacheEntry.from_bytes(cached)
+            if entry.fresh:
+                return entry
+    return None
+
+
+async def dispatch_refresh(request: Request) -> None:
+    """
+    Run a request through the app again, in-process, marked so the cached
+    endpoint recomputes and stores its entry. Like `cache_warmup.warm_cache`,
+    the request resolves its own dependencies: the ones resolved for the
+    original request are torn down once its response is sent.
+    """
+    scope = {
+        key: request.scope[key] for key in REFRESH_SCOPE_KEYS if key in request.scope
+    }
+    scope["state"] = dict(request.scope.get("state", {}))
+    scope[REVALIDATE_SCOPE_KEY] = True
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await request.scope["app"](scope, receive, send)
+
+
 # Cache decorator
-def cache_response(expiry: int = 60):
+def cache_response(
+    expiry: int = 60,
+    single_flight: bool = False,
+    stale_ttl: int = 0,
+    lock_timeout: float = 5.0,
+    lock_wait: float = 1.0,
+    poll_interval: float = 0.05,
+    local: bool = False,
+    tags: list[str] | None = None,
+    stale_while_revalidate: bool = False,
+    compress: bool = True,
+    negative_ttl: int = 0,
+    early_refresh: bool = False,
+    early_refresh_beta: float = 1.0,
+    adaptive_ttl: bool = False,
+    min_ttl: int | None = None,
+    max_ttl: int | None = None,
+    vary_on: list[str] | None = None,
+    user_key_budget: int | None = None,
+    middleware_hits: bool = False,
+    namespace: str | None = None,
+):
+    """
+    Cache the response of a GET endpoint in Redis.
+    Entries hold the final response bytes, so a hit is returned as-is without
+    validating against or serializing the `response_model` again.
+    Every response carries a strong ETag of its body; a matching
+    `If-None-Match` gets a bodiless `304 Not Modified`.
+
+    Args:
+        expiry: Seconds an entry is served as fresh.
+        single_flight: Let only one caller across all workers recompute an
+            expired entry. The others serve the stale entry if there is one,
+            otherwise they wait up to `lock_wait` seconds for the result.
+        stale_ttl: Extra seconds an expired entry is kept to be served stale.
+        lock_timeout: Seconds before the recompute lock expires on its own,
+            so a crashed holder cannot wedge the key.
+        lock_wait: Seconds a caller waits for another caller's result before
+            recomputing it itself.
+        poll_interval: Seconds between checks while waiting.
+        local: Keep fresh entries in the per-worker LRU tier as well, so hits
+            skip the Redis round trip. Workers evict each other's copies
+            through the Redis invalidation channel.
+        tags: Tags to index the entry under, so writes can invalidate it with
+            `invalidate_tags`. Tags are formatted with the endpoint's
+            arguments, e.g. "todo:{id}".
+        stale_while_revalidate: Treat `expiry` as a soft TTL and
+            `expiry + stale_ttl` as the hard TTL. In between, the stale entry
+            is served immediately and refreshed by a background task; only
+            past the hard TTL does a request wait for the endpoint. The
+            refresh sends the request through the app again, so it needs
+            the endpoint to be mounted on an app.
+        compress: Gzip entries of at least `cache_compression_threshold`
+            bytes. Clients sending `Accept-Encoding: gzip` get the stored
+            bytes with `Content-Encoding: gzip`, without decompressing.
+        negative_ttl: Seconds to cache a 404 raised by the endpoint (e.g.
+            `NotFoundError`), so lookups of missing rows skip the database.
+            Negative entries are indexed under `tags` like any other entry.
+        early_refresh: Recompute entries early, with a probability that
+            rises as expiry approaches and with how long the endpoint took
+            (XFetch). An entry picked for early refresh is handled like a
+            stale one, so it combines with `single_flight` and
+            `stale_while_revalidate`.
+        early_refresh_beta: Values above 1.0 refresh earlier, below later.
+        adaptive_ttl: Derive the fresh TTL from how often the entry's `tags`
+            are invalidated instead of using `expiry`, within `min_ttl` and
+            `max_ttl` (defaulting to the `cache_adaptive_*` settings).
+            Chosen TTLs are reported by `get_cache_stats()`.
+        vary_on: Cache a response per caller instead of once per path and
+            query. "subject" keeps a private entry per authenticated user,
+            "role" one entry per role claim and "header:<name>" one entry per
+            value of that header. Callers are identified by their verified
+            bearer token (or `request.state.principal`).
+        user_key_budget: Private entries kept per user when varying on
+            "subject", evicting the oldest first. Defaults to the
+            `cache_user_key_budget` setting.
+        middleware_hits: Let `CacheMiddleware` answer fresh hits before
+            FastAPI resolves the endpoint's dependencies, so hits open no
+            database session. Hits then skip every dependency, including
+            authentication, so only turn this on for public routes or ones
+            that vary on the caller. Routes with security dependencies (e.g.
+            `OAuth2PasswordBearer`) are never answered early.
+        namespace: Prefix of the route's keys, usually its module (e.g.
+            "todo"), so memory can be reported, budgeted and flushed per
+            namespace (see `cache_namespaces`).
+
+    Raises:
+        ValueError: If `vary_on` has an unsupported item.
+    """
+    validate_vary_on(vary_on or [])
+    per_user = VARY_SUBJECT in (vary_on or [])
+    if namespace:
+        namespaces.add(namespace)
+
     def decorator(func):
+        async def compute(request: Request, *args, **kwargs):
+            if iscoroutinefunction(func):
+                return await func(request, *args, **kwargs)
+            return await run_in_executor(func, request, *args, **kwargs)
+
+        async def recompute(
+            metrics, redis, cache_key: str, lock, request, args, kwargs
+        ):
+            """
+            Run the endpoint, store its response and release the lock.
+
+            Returns:
+                The response, and whether it was stored without a Redis error.
+            """
+            stored = True
+            try:
+                # Get response and render it once, as it will be served
+                entry_tags = [tag.format(**kwargs) for tag in tags or []]
+                entry_expiry = expiry
+                if adaptive_ttl:
+                    entry_expiry = await get_adaptive_ttl(
+                        redis,
+                        entry_tags,
+                        min_ttl or app_settings.cache_adaptive_min_ttl,
+                        max_ttl or app_settings.cache_adaptive_max_ttl,
+                    )
+                    ttl_stats.record(route_template(request), entry_expiry)
+
+                started = time.perf_counter()
+                try:
+                    response = await compute(request, *args, **kwargs)
+                    entry = render_response(request, response, entry_expiry)
+                    entry.delta = time.perf_counter() - started
+                    metrics.recompute_latency.observe(entry.delta)
+                    ttl = entry_expiry + stale_ttl
+                except HTTPException as e:
+                    if not negative_ttl or e.status_code != 404:
+                        raise
+                    # Remember the miss so repeated lookups skip the database
+                    entry = render_exception(e, negative_ttl)
+                    ttl = negative_ttl
+                if compress:
+                    entry.compress(
+                        app_settings.cache_compression_threshold,
+                        app_settings.cache_compression_level,
+                    )
+                try:
+                    await store_entry(redis, cache_key, entry, ttl, entry_tags)
+                    subject = get_subject(request) if per_user else None
+                    if subject:
+                        await track_user_key(
+                            redis,
+                            subject,
+                            cache_key,
+                            ttl,
+                            user_key_budget or app_settings.cache_user_key_budget,
+                        )
+                    if local:
+                        local_cache.set(
+                            cache_key, entry, entry.expires_at - time.time()
+                        )
+                        await publish_invalidation(redis, cache_key)
+                except RedisError as e:
+                    # The response is ready; only caching it failed
+                    stored = False
+                    redis_breaker.record_failure(redis)
+                    metrics.errors += 1
+                    logger.warning(f"Failed to cache {cache_key}: {e}")
+            finally:
+                if lock is not None:
+                    try:
+                        await lock.release()
+                    except LockError:
+                        # The lock already expired and may belong to someone else
+                        pass
+                    except RedisError:
+                        # Redis is failing; the lock expires on its own
+                        pass
+
+            return entry.to_response(request), stored
+
+        async def revalidate(metrics, redis, cache_key: str, request):
+            """Refresh a stale entry unless another caller already is."""
+            lock = redis.lock(f"lock:{cache_key}", timeout=lock_timeout, blocking=False)
+            try:
+                if not await lock.acquire():
+                    return
+                try:
+                    await dispatch_refresh(request)
+                finally:
+                    try:
+                        await lock.release()
+                    except (LockError, RedisError):
+                        # Expired or unreachable; the lock expires on its own
+                        pass
+            except Exception as e:
+                metrics.errors += 1
+                logger.error(f"Background refresh of {cache_key} failed: {e}")
+
         @wraps(func)
         async def wrapper(request: Request, *args, **kwargs):
-            redis = await get_redis()
-            cache_key = f"{request.url.path}"
-            if request.url.query:
-                cache_key = f"{cache_key}?{request.url.query}"
-
-            # Check cache
-            cached = await redis.get(cache_key)
-            if cached:
-                return json.loads(cached)
-
-            # Get response
-            response = (
-                await func(request, *args, **kwargs)
-                if iscoroutinefunction(func)
-                else func(request, *args, **kwargs)
-            )
+            metrics = cache_metrics.route(route_template(request))
 
-            # Cache with custom encoder
-            await redis.set(
-                cache_key, json.dumps(response, cls=ResponseEncoder), expiry
-            )
+            # Degrade to uncached while Redis is failing
+            lookup = request.scope.get(LOOKUP_SCOPE_KEY)
+            if not redis_breaker.allow() or (lookup is not None and lookup.failed):
+                metrics.bypasses += 1
+                return await compute(request, *args, **kwargs)
 
+            try:
+                response, healthy = await serve(metrics, request, lookup, args, kwargs)
+            except HTTPException:
+                raise
+            except RedisError as e:
+                redis_breaker.record_failure(await get_redis())
+                metrics.errors += 1
+                logger.warning(f"Cache unavailable, serving uncached: {e}")
+                return await compute(request, *args, **kwargs)
+            except Exception:
+                metrics.errors += 1
+                raise
+            # A failure to store the entry must keep counting towards opening
+            if healthy:
+                redis_breaker.record_success()
             return response
 
+        async def serve(metrics, request: Request, lookup, args, kwargs):
+            """
+            Answer a request from the cache or the endpoint.
+
+            Returns:
+                The response, and whether every Redis call succeeded.
+            """
+            redis = await get_redis()
+            if lookup is not None:
+                # `CacheMiddleware` already found no fresh entry
+                cache_key, entry = lookup.cache_key, lookup.entry
+            else:
+                cache_key = request_cache_key(request, kwargs, vary_on, namespace)
+
+            if request.scope.get(REVALIDATE_SCOPE_KEY):
+                # Background refresh dispatched by `revalidate`, which holds
+                # the lock
+                return await recompute(
+                    metrics, redis, cache_key, None, request, args, kwargs
+                )
+
+            if lookup is None:
+                entry, fresh = await find_entry(
+                    redis,
+                    cache_key,
+                    metrics,
+                    local,
+                    early_refresh,
+                    early_refresh_beta,
+                )
+                if fresh:
+                    return entry.to_response(request), True
+            stale = entry
+            redis_stats.misses += 1
+            metrics.misses += 1
+
+            # Serve the stale entry and refresh it off the request path
+            if stale is not None and stale_while_revalidate:
+                task = asyncio.create_task(
+                    revalidate(metrics, redis, cache_key, request)
+                )
+                background_refreshes.add(task)
+                task.add_done_callback(background_refreshes.discard)
+                metrics.stale_serves += 1
+                metrics.bytes_served += len(stale.body)
+                return stale.to_response(request), True
+
+            lock = None
+            if single_flight:
+                lock = redis.lock(
+                    f"lock:{cache_key}", timeout=lock_timeout, blocking=False
+                )
+                if not await lock.acquire():
+                    if stale is not None:
+                        metrics.stale_serves += 1
+                        metrics.bytes_served += len(stale.body)
+                        return stale.to_response(request), True
+                    entry = await wait_for_entry(
+                        redis, cache_key, lock_wait, poll_interval
+                    )
+                    if entry is not None:
+                        metrics.bytes_served += len(entry.body)
+                        return entry.to_response(request), True
+                    lock = None
+
+            return await recompute(
+                metrics, redis, cache_key, lock, request, args, kwargs
+            )
+
+        if middleware_hits:
+            wrapper.cached_route = CachedRoute(
+                local=local,
+                vary_on=vary_on or [],
+                early_refresh=early_refresh,
+                early_refresh_beta=early_refresh_beta,
+                namespace=namespace,
+            )
         return wrapper
 
     return decorator
@@ -0,0 +1,121 @@
+from redis import ConnectionPool, Redis
+from redis import asyncio as aioredis
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+from .config import AppSettings, app_settings
+from .redis_ring import ShardedRedis
+
+# Clients shared by the whole worker, opened in the application lifespan
+redis_clients: dict = {}
+
+
+def redis_node_urls(settings: AppSettings) -> dict[str, str]:
+    """URLs of the Redis nodes the cache is spread over, by node name."""
+    nodes = settings.redis_nodes or [f"{settings.redis_host}:{settings.redis_port}"]
+    return {node: f"redis://{node}" for node in nodes}
+
+
+def redis_pool_options(settings: AppSettings) -> dict:
+    """Connection pool options shared by the async and sync clients."""
+    return {
+        "max_connections": settings.redis_max_connections,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+        "retry_on_timeout": settings.redis_retry_on_timeout,
+        # The cache stores raw response bytes
+        "decode_responses": False,
+    }
+
+
+def create_redis(settings: AppSettings = app_settings) -> aioredis.Redis:
+    """
+    Async Redis client backed by a pool sized from the settings.
+    With several `redis_nodes`, keys are spread over them by a consistent
+    hash ring, with one pool per node.
+    """
+    clients = {}
+    for node, url in redis_node_urls(settings).items():
+        pool = aioredis.ConnectionPool.from_url(url, **redis_pool_options(settings))
+        clients[node] = aioredis.Redis(
+            connection_pool=pool,
+            retry=AsyncRetry(ExponentialBackoff(), settings.redis_retries),
+        )
+    if len(clients) == 1:
+        return next(iter(clients.values()))
+    return ShardedRedis(clients, is_async=True)
+
+
+def create_sync_redis(settings: AppSettings = app_settings) -> Redis:
+    """Sync Redis client for code running in the threadpool (sync routes)."""
+    clients = {}
+    for node, url in redis_node_urls(settings).items():
+        pool = ConnectionPool.from_url(url, **redis_pool_options(settings))
+        clients[node] = Redis(
+            connection_pool=pool,
+            retry=Retry(ExponentialBackoff(), settings.redis_retries),
+        )
+    if len(clients) == 1:
+        return next(iter(clients.values()))
+    return ShardedRedis(clients, is_async=False)
+
+
+def set_redis_clients(redis, sync_redis) -> None:
+    """Register the clients returned by `get_redis` and `get_sync_redis`."""
+    redis_clients["async"] = redis
+    redis_clients["sync"] = sync_redis
+
+
+async def open_redis_clients(settings: AppSettings = app_settings) -> None:
+    """Create the worker's Redis clients; called on application startup."""
+    set_redis_clients(create_redis(settings), create_sync_redis(settings))
+
+
+async def close_redis_clients() -> None:
+    """Close the worker's Redis clients; called on application shutdown."""
+    redis = redis_clients.pop("async", None)
+    sync_redis = redis_clients.pop("sync", None)
+    if redis is not None:
+        await redis.aclose()
+    if sync_redis is not None:
+        sync_redis.close()
+
+
+async def get_redis() -> aioredis.Redis:
+    """Dependency providing the worker's async Redis client."""
+    return redis_clients["async"]
+
+
+def get_sync_redis() -> Redis:
+    """Dependency providing the worker's sync Redis client."""
+    return redis_clients["sync"]
+
+
+def pool_stats(client) -> dict | None:
+    """Utilisation of a client's connection pool, per node when sharded."""
+    if isinstance(client, ShardedRedis):
+        return {
+            node: pool_stats(node_client)
+            for node, node_client in client.clients.items()
+        }
+    pool = getattr(client, "connection_pool", None)
+    if pool is None:
+        return None
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    idle = len(getattr(pool, "_available_connections", ()))
+    max_connections = pool.max_connections
+    return {
+        "max_connections": max_connections,
+        "in_use": in_use,
+        "idle": idle,
+        "utilisation": in_use / max_connections if max_connections else None,
+    }
+
+
+def get_redis_pool_stats() -> dict:
+    """Pool utilisation of the async and sync Redis clients."""
+    return {
+        "async": pool_stats(redis_clients.get("async")),
+        "sync": pool_stats(redis_clients.get("sync")),
+    }
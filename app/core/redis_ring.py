@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import hashlib
+from inspect import isawaitable
+
+# Commands taking several keys, split across the nodes that own them
+MULTI_KEY_COMMANDS = {"delete", "unlink", "exists"}
+
+# Commands without a key, sent to the first node; every worker subscribes to
+# the invalidation channel there
+PRIMARY_NODE_COMMANDS = {"publish", "pubsub"}
+
+
+def hash_key(key: bytes | str) -> str:
+    """
+    Part of a key that decides its node. As in Redis Cluster, a non-empty
+    `{hash tag}` pins related keys (e.g. "{todo}:list", "{todo}:1") together.
+    """
+    key = key.decode() if isinstance(key, bytes) else key
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def ring_position(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
+
+
+class HashRing:
+    """
+    Consistent hash ring. Each node owns `replicas` points on the ring, so
+    adding or removing a node only remaps the keys between its points.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int = 128):
+        self.replicas = replicas
+        self._positions: list[int] = []
+        self._nodes: dict[int, str] = {}
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str) -> None:
+        for replica in range(self.replicas):
+            position = ring_position(f"{node}#{replica}")
+            bisect.insort(self._positions, position)
+            self._nodes[position] = node
+
+    def remove_node(self, node: str) -> None:
+        for replica in range(self.replicas):
+            position = ring_position(f"{node}#{replica}")
+            self._positions.remove(position)
+            del self._nodes[position]
+
+    def get_node(self, key: bytes | str) -> str:
+        if not self._positions:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._positions, ring_position(hash_key(key)))
+        return self._nodes[self._positions[index % len(self._positions)]]
+
+
+class ShardedRedis:
+    """
+    Spreads keys over several standalone Redis nodes with a `HashRing`.
+    Exposes the client API the cache uses: single-key commands are routed to
+    the key's node, multi-key commands are split by node and pipelines are
+    executed per node. Works with async and sync clients alike.
+
+    Args:
+        clients: Redis clients by node name, e.g. {"redis-1:6379": client}.
+        is_async: Whether the clients are `redis.asyncio` clients.
+    """
+
+    def __init__(self, clients: dict, is_async: bool = True):
+        self.clients = clients
+        self.is_async = is_async
+        self.ring = HashRing(list(clients))
+        self.primary = next(iter(clients.values()))
+
+    def node_for(self, key: bytes | str):
+        return self.clients[self.ring.get_node(key)]
+
+    def pipeline(self, transaction: bool = False) -> "ShardedPipeline":
+        return ShardedPipeline(self, transaction)
+
+    def _split(self, command: str, *keys):
+        """Run a multi-key command on every node owning some of the keys."""
+        by_node: dict[str, list] = {}
+        for key in keys:
+            by_node.setdefault(self.ring.get_node(key), []).append(key)
+        results = [
+            getattr(self.clients[node], command)(*node_keys)
+            for node, node_keys in by_node.items()
+        ]
+        if self.is_async:
+            return _sum_results(results)
+        return sum(results)
+
+    def ping(self):
+        """
+        Ping every node. Fails while any node is down, so the circuit breaker
+        probing the ring only closes once the failing node answers again.
+        """
+        results = [client.ping() for client in self.clients.values()]
+        if self.is_async:
+            return _all_results(results)
+        return all(results)
+
+    def scan_iter(self, *args, **kwargs):
+        """Iterate the keys of every node, one node after another."""
+        if self.is_async:
+            return self._scan_iter_async(*args, **kwargs)
+        return (
+            key
+            for client in self.clients.values()
+            for key in client.scan_iter(*args, **kwargs)
+        )
+
+    async def _scan_iter_async(self, *args, **kwargs):
+        for client in self.clients.values():
+            async for key in client.scan_iter(*args, **kwargs):
+                yield key
+
+    def __getattr__(self, command: str):
+        if command in MULTI_KEY_COMMANDS:
+            return lambda *keys: self._split(command, *keys)
+        if command in PRIMARY_NODE_COMMANDS:
+            return getattr(self.primary, command)
+        if command == "object":
+            # OBJECT takes its key second, e.g. OBJECT IDLETIME key
+            return lambda infotype, key: self.node_for(key).object(infotype, key)
+
+        def route(key, *args, **kwargs):
+            return getattr(self.node_for(key), command)(key, *args, **kwargs)
+
+        return route
+
+    async def aclose(self) -> None:
+        for client in self.clients.values():
+            await client.aclose()
+
+    def close(self) -> None:
+        for client in self.clients.values():
+            client.close()
+
+
+async def _sum_results(results) -> int:
+    return sum(await asyncio.gather(*results))
+
+
+async def _all_results(results) -> bool:
+    return all(await asyncio.gather(*results))
+
+
+class ShardedPipeline:
+    """
+    Buffers keyed commands, runs one pipeline per node on `execute` and
+    returns the results in the order the commands were queued.
+    """
+
+    def __init__(self, redis: ShardedRedis, transaction: bool):
+        self.redis = redis
+        self.transaction = transaction
+        self._commands: list[tuple[str, str, tuple, dict]] = []
+
+    def __getattr__(self, command: str):
+        def queue(key, *args, **kwargs):
+            node = self.redis.ring.get_node(key)
+            self._commands.append((node, command, (key, *args), kwargs))
+            return self
+
+        return queue
+
+    def _node_pipelines(self):
+        pipelines, positions = {}, {}
+        for index, (node, command, args, kwargs) in enumerate(self._commands):
+            if node not in pipelines:
+                pipelines[node] = self.redis.clients[node].pipeline(
+                    transaction=self.transaction
+                )
+                positions[node] = []
+            getattr(pipelines[node], command)(*args, **kwargs)
+            positions[node].append(index)
+        self._commands = []
+        return pipelines, positions
+
+    def _merge(self, positions: dict, node_results: dict) -> list:
+        results = [None] * sum(len(indexes) for indexes in positions.values())
+        for node, indexes in positions.items():
+            for index, result in zip(indexes, node_results[node]):
+                results[index] = result
+        return results
+
+    def execute(self):
+        pipelines, positions = self._node_pipelines()
+        node_results = {node: pipe.execute() for node, pipe in pipelines.items()}
+        if not self.redis.is_async:
+            return self._merge(positions, node_results)
+
+        async def gather():
+            results = await asyncio.gather(
+                *(
+                    result if isawaitable(result) else asyncio.sleep(0, result)
+                    for result in node_results.values()
+                )
+            )
+            return self._merge(positions, dict(zip(node_results, results)))
+
+        return gather()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._commands = []
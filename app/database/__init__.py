@@ -1,6 +1,16 @@
-from .session import Base, engine, SessionLocal, get_db
+from .session import (
+    Base,
+    engine,
+    SessionLocal,
+    get_db,
+    async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+    get_pool_stats,
+)
 from .helper import (
     DatabaseRepository,
+    AsyncDatabaseRepository,
 )
 
 __all__ = [
@@ -8,5 +18,10 @@ __all__ = [
     "engine",
     "SessionLocal",
     "get_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "get_pool_stats",
     "DatabaseRepository",
+    "AsyncDatabaseRepository",
 ]
@@ -1,4 +1,7 @@
-from typing import TypeVar, Type
+import io
+from typing import Iterable, TypeVar, Type
+from sqlalchemy import Select, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, Query
 from pydantic import BaseModel
 from app.core.exceptions import DatabaseError, NotFoundError, BadRequestError
@@ -6,6 +9,39 @@ from app.core.exceptions import DatabaseError, NotFoundError, BadRequestError
 ModelType = TypeVar("ModelType")
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
+# Rows per INSERT statement and commit in `create_many`
+BULK_BATCH_SIZE = 1000
+
+
+def batched(items: Iterable, batch_size: int):
+    """Split items into lists of at most `batch_size`."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def filter_conditions(model, filters: dict) -> list:
+    """Equality conditions on a model's columns, e.g. {"user_id": 1}."""
+    return [getattr(model, field) == value for field, value in filters.items()]
+
+
+def copy_text(value) -> str:
+    """Format a value for COPY ... FROM STDIN in PostgreSQL's text format."""
+    if value is None:
+        return r"\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
 
 class DatabaseRepository:
     def __init__(self, db: Session, model: Type[ModelType]):
@@ -37,10 +73,7 @@ class DatabaseRepository:
         Returns:
             Filtered query object
         """
-        query = self.query()
-        for field, value in filters.items():
-            query = query.filter(getattr(self.model, field) == value)
-        return query
+        return self.query().filter(*filter_conditions(self.model, filters))
 
     def get_by_filter(self, filters: dict) -> list[ModelType] | None:
         """
@@ -49,7 +82,7 @@ class DatabaseRepository:
 
         Args:
             filters: Dictionary of filter criteria.
-        
+
         Returns: List of records or None if no records found.
 
         Raises:
@@ -67,7 +100,7 @@ class DatabaseRepository:
 
         Args:
             filters: Dictionary of filter criteria.
-        
+
         Returns: Single record or None if no record found.
 
         Raises:
@@ -115,16 +148,118 @@ class DatabaseRepository:
         try:
             record = self.model(**data.model_dump())
             self.db.add(record)
+            # The INSERT returns the generated id and server defaults
             self.db.commit()
-            self.db.refresh(record)
             return record
         except Exception as e:
             self.db.rollback()
             raise DatabaseError(detail=f"Error creating record: {e}")
 
+    def create_many(
+        self,
+        items: Iterable[SchemaType],
+        batch_size: int = BULK_BATCH_SIZE,
+        returning: bool = True,
+    ) -> list[ModelType] | list[int]:
+        """
+        Create many records with multi-row INSERT ... RETURNING statements,
+        committing once per batch instead of once per record.
+        Batches committed before an error stay committed.
+
+        Args:
+            items: Pydantic models with create data
+            batch_size: Records per INSERT statement and commit
+            returning: Return the created records; otherwise only their ids
+
+        Returns:
+            Created model instances, or their ids
+
+        Raises:
+            DatabaseError: If there is an error creating the records
+        """
+        statement = insert(self.model).returning(
+            self.model if returning else self.model.id
+        )
+        created = []
+        try:
+            for batch in batched(items, batch_size):
+                rows = [item.model_dump() for item in batch]
+                created.extend(self.db.scalars(statement, rows).all())
+                self.db.commit()
+            return created
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(detail=f"Error creating records: {e}")
+
+    def copy_many(
+        self, items: Iterable[SchemaType], batch_size: int = BULK_BATCH_SIZE * 50
+    ) -> int:
+        """
+        Load many records with PostgreSQL's COPY ... FROM STDIN, for large
+        imports. Faster than `create_many` but returns no rows. Column
+        defaults set in Python are applied here; server defaults by the
+        database.
+
+        Args:
+            items: Pydantic models with create data
+            batch_size: Records per COPY and commit
+
+        Returns:
+            Number of records created
+
+        Raises:
+            DatabaseError: If there is an error loading the records
+        """
+        table = self.model.__table__
+        dialect = self.db.get_bind().dialect
+        count = 0
+        try:
+            for batch in batched(items, batch_size):
+                rows = [self._copy_row(item.model_dump()) for item in batch]
+                columns = [table.c[name] for name in rows[0]]
+                processors = [
+                    column.type.bind_processor(dialect) or (lambda value: value)
+                    for column in columns
+                ]
+                buffer = io.StringIO()
+                for row in rows:
+                    values = [
+                        copy_text(process(value))
+                        for process, value in zip(processors, row.values())
+                    ]
+                    buffer.write("\t".join(values) + "\n")
+                buffer.seek(0)
+
+                names = ", ".join(f'"{column.name}"' for column in columns)
+                cursor = self.db.connection().connection.cursor()
+                try:
+                    cursor.copy_expert(
+                        f'COPY "{table.name}" ({names}) FROM STDIN', buffer
+                    )
+                finally:
+                    cursor.close()
+                self.db.commit()
+                count += len(rows)
+            return count
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(detail=f"Error copying records: {e}")
+
+    def _copy_row(self, data: dict) -> dict:
+        """Add the Python-side column defaults an INSERT would apply."""
+        for column in self.model.__table__.columns:
+            if column.name in data or column.default is None:
+                continue
+            if column.default.is_callable:
+                data[column.name] = column.default.arg(None)
+            elif column.default.is_scalar:
+                data[column.name] = column.default.arg
+        return data
+
     def update(self, id: int, data: SchemaType) -> ModelType:
         """
-        Update an existing record.
+        Update an existing record with a single UPDATE ... RETURNING
+        statement, without fetching it first.
         Only updates fields that were set in the input data.
 
         Args:
@@ -139,25 +274,27 @@ class DatabaseRepository:
             BadRequestError: If no update data is provided
             DatabaseError: If there is an error updating the record
         """
-        try:
-            record = self.get_one(id)
-            update_data = data.model_dump(
-                exclude_unset=True
-            )  # Only update fields that are provided
-
-            if not update_data:
-                raise BadRequestError(detail="No data to update")
-
-            for field, value in update_data.items():
-                setattr(record, field, value)
+        # Only update fields that are provided
+        update_data = data.model_dump(exclude_unset=True)
+        if not update_data:
+            raise BadRequestError(detail="No data to update")
 
+        try:
+            record = self.db.scalars(
+                update(self.model)
+                .where(self.model.id == id)
+                .values(**update_data)
+                .returning(self.model)
+            ).first()
             self.db.commit()
-            self.db.refresh(record)
-            return record
         except Exception as e:
             self.db.rollback()
             raise DatabaseError(detail=f"Error updating item: {e}")
 
+        if record is None:
+            raise NotFoundError(detail=f"Record {id} not found")
+        return record
+
     def update_by_filter(self, filters: dict, data: SchemaType) -> ModelType:
         """
         Update an record by filter criteria.
@@ -177,49 +314,49 @@ class DatabaseRepository:
                 setattr(record, field, value)
 
             self.db.commit()
-            self.db.refresh(record)
             return record
         except Exception as e:
             self.db.rollback()
             raise DatabaseError(detail=f"Error updating record by filter: {e}")
 
-    def update_multiple_by_filter(self, filters: dict, data: SchemaType) -> list[ModelType]:
+    def update_multiple_by_filter(
+        self, filters: dict, data: SchemaType, returning: bool = True
+    ) -> list[ModelType] | int:
         """
-        Update multiple records that match the filter criteria.
+        Update multiple records that match the filter criteria with a single
+        UPDATE ... WHERE statement, without loading them first.
         Example: update_multiple_by_filter({"status": "pending"}, update_data)
 
         Args:
             filters: Dictionary of filter criteria
             data: Pydantic model with update data
+            returning: Return the updated records (UPDATE ... RETURNING);
+                otherwise only how many were updated
 
         Returns:
-            List of updated model instances
+            List of updated model instances, or the number of updated records
 
         Raises:
             BadRequestError: If no update data is provided
             DatabaseError: If there is an error updating the records
         """
         try:
-            # Get all matching records
-            records = self._build_query(filters).all()
-            
-            # Prepare update data
             update_data = data.model_dump(exclude_unset=True)
             if not update_data:
                 raise BadRequestError(detail="No data to update")
 
-            # Update all records
-            for record in records:
-                for field, value in update_data.items():
-                    setattr(record, field, value)
+            statement = (
+                update(self.model)
+                .where(*filter_conditions(self.model, filters))
+                .values(**update_data)
+            )
+            if returning:
+                result = self.db.scalars(statement.returning(self.model)).all()
+            else:
+                result = self.db.execute(statement).rowcount
 
             self.db.commit()
-            
-            # Refresh all records to get updated values
-            for record in records:
-                self.db.refresh(record)
-                
-            return records
+            return result
         except Exception as e:
             self.db.rollback()
             raise DatabaseError(detail=f"Error updating records by filter: {e}")
@@ -238,18 +375,332 @@ class DatabaseRepository:
             self.db.rollback()
             raise DatabaseError(detail=f"Error deleting item: {e}")
 
-    def delete_by_filter(self, filters: dict) -> bool:
+    def delete_by_filter(
+        self, filters: dict, returning: bool = False
+    ) -> int | list[ModelType]:
         """
-        Delete items matching multiple filter criteria.
+        Delete items matching multiple filter criteria with a single
+        DELETE ... WHERE statement, without loading them first.
         Example: delete_by_filter({"user_id": 1, "status": "active"})
+
+        Args:
+            filters: Dictionary of filter criteria
+            returning: Return the deleted records (DELETE ... RETURNING)
+                instead of how many were deleted
+
+        Returns:
+            Number of deleted records, or the deleted model instances
+
+        Raises:
+            DatabaseError: If there is an error deleting the records
         """
         try:
-            items = self._build_query(filters).all()
-            for item in items:
-                self.db.delete(item)
+            statement = delete(self.model).where(
+                *filter_conditions(self.model, filters)
+            )
+            if returning:
+                result = self.db.scalars(statement.returning(self.model)).all()
+            else:
+                result = self.db.execute(statement).rowcount
 
             self.db.commit()
-            return True
+            return result
         except Exception as e:
             self.db.rollback()
             raise DatabaseError(detail=f"Error deleting items: {e}")
+
+
+class AsyncDatabaseRepository:
+    """
+    Async counterpart of `DatabaseRepository` on an `AsyncSession`, with the
+    same methods as coroutines. Statements are built with `select()` instead
+    of `query()` and run with `all()`, `first()` or `count()`.
+    """
+
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
+        self.db = db
+        self.model = model
+
+    def select(self) -> Select:
+        """
+        Get a select statement for the given model.
+
+        Returns:
+            Select statement for the given model.
+        """
+        return select(self.model)
+
+    def _build_query(self, filters: dict) -> Select:
+        """
+        Build a filtered select statement based on filter criteria
+
+        Args:
+            filters: Dictionary of filter criteria.
+
+        Returns:
+            Filtered select statement
+        """
+        return self.select().where(*filter_conditions(self.model, filters))
+
+    async def all(self, statement: Select) -> list[ModelType]:
+        """
+        Get every record a select statement returns.
+
+        Raises:
+            DatabaseError: If there is an error querying the database
+        """
+        try:
+            return list((await self.db.scalars(statement)).all())
+        except Exception as e:
+            raise DatabaseError(detail=f"Error: {e}")
+
+    async def first(self, statement: Select) -> ModelType | None:
+        """
+        Get the first record a select statement returns.
+
+        Raises:
+            DatabaseError: If there is an error querying the database
+        """
+        try:
+            return (await self.db.scalars(statement.limit(1))).first()
+        except Exception as e:
+            raise DatabaseError(detail=f"Error: {e}")
+
+    async def count(self, statement: Select) -> int:
+        """
+        Count the records a select statement returns, ignoring its ordering.
+
+        Raises:
+            DatabaseError: If there is an error querying the database
+        """
+        try:
+            return await self.db.scalar(
+                select(func.count()).select_from(statement.order_by(None).subquery())
+            )
+        except Exception as e:
+            raise DatabaseError(detail=f"Error: {e}")
+
+    async def get_by_filter(self, filters: dict) -> list[ModelType] | None:
+        """
+        Get multiple records by filter criteria.
+        Example: await get_by_filter({"user_id": 1, "code": "123456"})
+
+        Args:
+            filters: Dictionary of filter criteria.
+
+        Returns: List of records or None if no records found.
+
+        Raises:
+            DatabaseError: If there is an error querying the database
+        """
+        return await self.all(self._build_query(filters))
+
+    async def get_one_by_filter(self, filters: dict) -> ModelType | None:
+        """
+        Get one record by filter criteria.
+        Example: await get_one_by_filter({"user_id": 1, "code": "123456"})
+
+        Args:
+            filters: Dictionary of filter criteria.
+
+        Returns: Single record or None if no record found.
+
+        Raises:
+            DatabaseError: If there is an error querying the database
+        """
+        return await self.first(self._build_query(filters))
+
+    async def get_one(self, id: int) -> ModelType | None:
+        """
+        Get one record by id.
+        Using a filter instead of get() for future RLS compatibility.
+
+        Args:
+            id: ID of the record to retrieve.
+
+        Returns:
+            Record with the given id.
+
+        Raises:
+            DatabaseError: If there is an error querying the database
+        """
+        return await self.first(self.select().where(self.model.id == id))
+
+    async def create(self, data: SchemaType) -> ModelType:
+        """
+        Create a new record.
+
+        Args:
+            data: Pydantic model with create data
+
+        Returns:
+            Created model instance
+
+        Raises:
+            DatabaseError: If there is an error creating the record
+        """
+        try:
+            record = self.model(**data.model_dump())
+            self.db.add(record)
+            # The INSERT returns the generated id and server defaults
+            await self.db.commit()
+            return record
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error creating record: {e}")
+
+    async def create_many(
+        self,
+        items: Iterable[SchemaType],
+        batch_size: int = BULK_BATCH_SIZE,
+        returning: bool = True,
+    ) -> list[ModelType] | list[int]:
+        """
+        Create many records with multi-row INSERT ... RETURNING statements,
+        committing once per batch. See `DatabaseRepository.create_many`.
+
+        Raises:
+            DatabaseError: If there is an error creating the records
+        """
+        statement = insert(self.model).returning(
+            self.model if returning else self.model.id
+        )
+        created = []
+        try:
+            for batch in batched(items, batch_size):
+                rows = [item.model_dump() for item in batch]
+                created.extend((await self.db.scalars(statement, rows)).all())
+                await self.db.commit()
+            return created
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error creating records: {e}")
+
+    async def update(self, id: int, data: SchemaType) -> ModelType:
+        """
+        Update an existing record with a single UPDATE ... RETURNING
+        statement. See `DatabaseRepository.update`.
+
+        Raises:
+            NotFoundError: If the record is not found
+            BadRequestError: If no update data is provided
+            DatabaseError: If there is an error updating the record
+        """
+        update_data = data.model_dump(exclude_unset=True)
+        if not update_data:
+            raise BadRequestError(detail="No data to update")
+
+        try:
+            record = (
+                await self.db.scalars(
+                    update(self.model)
+                    .where(self.model.id == id)
+                    .values(**update_data)
+                    .returning(self.model)
+                )
+            ).first()
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error updating item: {e}")
+
+        if record is None:
+            raise NotFoundError(detail=f"Record {id} not found")
+        return record
+
+    async def update_by_filter(self, filters: dict, data: SchemaType) -> ModelType:
+        """
+        Update an record by filter criteria.
+        Example: await update_by_filter({"user_id": 1, "code": "123456"}, data)
+        """
+        try:
+            record = await self.first(self._build_query(filters))
+            if not record:
+                raise NotFoundError(detail="Record not found with given filters")
+
+            update_data = data.model_dump(exclude_unset=True)
+            if not update_data:
+                raise BadRequestError(detail="No data to update")
+
+            for field, value in update_data.items():
+                setattr(record, field, value)
+
+            await self.db.commit()
+            return record
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error updating record by filter: {e}")
+
+    async def update_multiple_by_filter(
+        self, filters: dict, data: SchemaType, returning: bool = True
+    ) -> list[ModelType] | int:
+        """
+        Update multiple records that match the filter criteria with a single
+        UPDATE ... WHERE statement. See
+        `DatabaseRepository.update_multiple_by_filter`.
+        Example: await update_multiple_by_filter({"status": "pending"}, data)
+
+        Raises:
+            BadRequestError: If no update data is provided
+            DatabaseError: If there is an error updating the records
+        """
+        try:
+            update_data = data.model_dump(exclude_unset=True)
+            if not update_data:
+                raise BadRequestError(detail="No data to update")
+
+            statement = (
+                update(self.model)
+                .where(*filter_conditions(self.model, filters))
+                .values(**update_data)
+            )
+            if returning:
+                result = (await self.db.scalars(statement.returning(self.model))).all()
+            else:
+                result = (await self.db.execute(statement)).rowcount
+
+            await self.db.commit()
+            return result
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error updating records by filter: {e}")
+
+    async def delete(self, id: int) -> bool:
+        """
+        Delete an item by id.
+        Returns True if successful.
+        """
+        try:
+            item = await self.get_one(id)
+            await self.db.delete(item)
+            await self.db.commit()
+            return True
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error deleting item: {e}")
+
+    async def delete_by_filter(
+        self, filters: dict, returning: bool = False
+    ) -> int | list[ModelType]:
+        """
+        Delete items matching multiple filter criteria with a single
+        DELETE ... WHERE statement. See `DatabaseRepository.delete_by_filter`.
+        Example: await delete_by_filter({"user_id": 1, "status": "active"})
+
+        Raises:
+            DatabaseError: If there is an error deleting the records
+        """
+        try:
+            statement = delete(self.model).where(
+                *filter_conditions(self.model, filters)
+            )
+            if returning:
+                result = (await self.db.scalars(statement.returning(self.model))).all()
+            else:
+                result = (await self.db.execute(statement)).rowcount
+
+            await self.db.commit()
+            return result
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseError(detail=f"Error deleting items: {e}")
@@ -0,0 +1,124 @@
+import time
+import uuid
+from dataclasses import dataclass, field
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.core.cache_metrics import Histogram
+from app.core.config import AppSettings
+
+# Pooling modes of `db_pool_mode`
+POOL_MODE_QUEUE = "queue"
+# No pooling in the app, for an external pooler such as pgbouncer in
+# transaction mode
+POOL_MODE_NULL = "null"
+
+
+@dataclass
+class PoolStats:
+    """Connection pool counters, fed by SQLAlchemy pool events."""
+
+    checked_out: int = 0
+    checkouts: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    # Seconds callers waited for a connection, including opening new ones
+    wait: Histogram = field(default_factory=Histogram)
+
+    def to_dict(self, pool) -> dict:
+        stats = {
+            "checked_out": self.checked_out,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait": self.wait.to_dict(),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+class InstrumentedPool:
+    """
+    Times `connect()`, the point where callers queue for a connection, and
+    counts checkout timeouts. Mixed into a pool class by `instrumented_pool`.
+    """
+
+    stats: PoolStats
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.wait.observe(time.perf_counter() - started)
+
+
+def instrumented_pool(pool_class: type, stats: PoolStats) -> type:
+    """A subclass of `pool_class` reporting to `stats`; kept on `recreate()`."""
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (InstrumentedPool, pool_class),
+        {"stats": stats},
+    )
+
+
+def engine_options(settings: AppSettings, stats: PoolStats, is_async: bool) -> dict:
+    """
+    Keyword arguments for `create_engine`/`create_async_engine` from the
+    `db_pool_*` settings.
+
+    Raises:
+        ValueError: If `db_pool_mode` is unknown.
+    """
+    if settings.db_pool_mode == POOL_MODE_NULL:
+        options = {"poolclass": instrumented_pool(NullPool, stats)}
+        if is_async:
+            # Prepared statements do not survive pgbouncer transaction pooling
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+
+    if settings.db_pool_mode != POOL_MODE_QUEUE:
+        raise ValueError(f"Unknown db_pool_mode {settings.db_pool_mode!r}")
+    return {
+        "poolclass": instrumented_pool(
+            AsyncAdaptedQueuePool if is_async else QueuePool, stats
+        ),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def watch_pool(engine, stats: PoolStats) -> None:
+    """Feed `stats` from the pool events of a sync engine."""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.checkouts += 1
+        stats.checked_out += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.checked_out -= 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.invalidations += 1
@@ -1,20 +1,51 @@
 import logging
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import app_settings
+from .pool import PoolStats, engine_options, watch_pool
 
 # Create Base class for models
 Base = declarative_base()
 
-# Create engine
-engine = create_engine(app_settings.database_url)
+# Create engine, with the pool configured by the db_pool_* settings
+pool_stats = PoolStats()
+engine = create_engine(
+    app_settings.database_url,
+    **engine_options(app_settings, pool_stats, is_async=False),
+)
+watch_pool(engine, pool_stats)
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class; rows loaded by RETURNING stay usable after
+# commit instead of being reloaded one by one
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Create async engine, for routes that must not block the event loop
+async_pool_stats = PoolStats()
+async_engine = create_async_engine(
+    app_settings.async_database_url,
+    **engine_options(app_settings, async_pool_stats, is_async=True),
+)
+watch_pool(async_engine.sync_engine, async_pool_stats)
+
+# Create AsyncSessionLocal class; loaded attributes stay usable after commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
 
 logger = logging.getLogger(__name__)
 
 
+def get_pool_stats() -> dict:
+    """Live statistics of the sync and async connection pools."""
+    return {
+        "sync": pool_stats.to_dict(engine.pool),
+        "async": async_pool_stats.to_dict(async_engine.pool),
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -26,3 +57,16 @@ def get_db():
     finally:
         logger.debug("Database connection closed")
         db.close()
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        logger.debug("Async database connection established")
+        yield db
+    except Exception as e:
+        logger.error(f"Database error occurred: {str(e)}")
+        raise
+    finally:
+        logger.debug("Async database connection closed")
+        await db.close()
@@ -1,21 +1,60 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
 from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import Dict
-from app.database import get_db
-from app.core import app_settings
+from app.database import async_engine, get_async_db, get_db, get_pool_stats
+from app.core import get_cache_stats, get_redis
+from app.core.cache_middleware import CacheMiddleware
+from app.core.cache_namespaces import (
+    flush_namespace,
+    get_cache_memory,
+    require_cache_admin,
+    trim_namespaces_periodically,
+)
+from app.core.cache_warmup import save_hot_keys, warm_cache_on_startup
+from app.core.redis import listen_for_invalidations
+from app.core.redis_pool import close_redis_clients, open_redis_clients
 from app.modules.todo.router import router as todo_router
+
 # from app.modules._auth.router import router as auth_router
 # from app.modules._user.router import router as user_router
 
 
+"""
+Application startup and shutdown
+"""
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_redis_clients()
+    redis = await get_redis()
+    cache_listener = asyncio.create_task(listen_for_invalidations(redis))
+    cache_trimmer = asyncio.create_task(trim_namespaces_periodically(redis))
+    # Serve the first requests from a warm cache
+    await warm_cache_on_startup(app, redis)
+    yield
+    await save_hot_keys(redis)
+    cache_listener.cancel()
+    cache_trimmer.cancel()
+    await close_redis_clients()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="FastAPI Base Application",
     description="FastAPI Base Application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Answers cache hits before any dependency is resolved
+app.add_middleware(CacheMiddleware)
+
 
 """
 Application module routers
@@ -26,25 +65,6 @@ app.include_router(todo_router)
 # app.include_router(auth_router)
 # app.include_router(user_router)
 
-"""
-Application startup and shutdown events
-"""
-
-
-@app.on_event("startup")
-async def startup_event():
-    app.state.redis = aioredis.from_url(
-        f"redis://{app_settings.redis_host}:{app_settings.redis_port}",
-        encoding="utf-8",
-        decode_responses=True,
-    )
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await app.state.redis.close()
-
-
 """
 Application default routes
 """
@@ -61,20 +81,51 @@ async def db_test(db: Session = Depends(get_db)):
 
 
 @app.get("/redis-test")
-async def redis_test():
-    await app.state.redis.incr("hits")
-    return {"hits": await app.state.redis.get("hits")}
+async def redis_test(redis: aioredis.Redis = Depends(get_redis)):
+    await redis.incr("hits")
+    return {"hits": await redis.get("hits")}
+
+
+@app.get("/internal/cache-stats", include_in_schema=False)
+async def cache_stats() -> Dict:
+    return get_cache_stats()
+
+
+@app.get("/internal/db-pool-stats", include_in_schema=False)
+async def db_pool_stats() -> Dict:
+    return get_pool_stats()
+
+
+@app.get(
+    "/internal/cache-memory",
+    include_in_schema=False,
+    dependencies=[Depends(require_cache_admin)],
+)
+async def cache_memory(redis: aioredis.Redis = Depends(get_redis)) -> Dict:
+    return await get_cache_memory(redis)
+
+
+@app.delete(
+    "/internal/cache/{namespace}",
+    include_in_schema=False,
+    dependencies=[Depends(require_cache_admin)],
+)
+async def flush_cache_namespace(
+    namespace: str, redis: aioredis.Redis = Depends(get_redis)
+) -> Dict:
+    return {"namespace": namespace, "deleted": await flush_namespace(redis, namespace)}
 
 
 @app.get("/health", status_code=status.HTTP_200_OK)
 async def health_check(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    redis: aioredis.Redis = Depends(get_redis),
 ) -> Dict[str, str]:
     try:
         # Use text() for raw SQL
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         # Check Redis
-        await app.state.redis.ping()
+        await redis.ping()
 
         return {"status": "healthy"}
     except Exception as e:
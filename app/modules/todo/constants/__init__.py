@@ -1,3 +1,4 @@
+from .cache import TODO_CACHE_NAMESPACE, TODO_LIST_CACHE_TAG, TODO_CACHE_TAG
 from .enums import TodoSeverityEnum, TodoStatusEnum, TodoSortFieldsEnum
 from .route_doc import (
     CREATE_TODO_DOC,
@@ -9,6 +10,9 @@ from .route_doc import (
 )
 
 __all__ = [
+    "TODO_CACHE_NAMESPACE",
+    "TODO_LIST_CACHE_TAG",
+    "TODO_CACHE_TAG",
     "TodoSeverityEnum",
     "TodoStatusEnum",
     "TodoSortFieldsEnum",
@@ -0,0 +1,12 @@
+"""
+this file contains the cache namespace and tags for the todo module
+"""
+
+# Prefix of every cached todo response
+TODO_CACHE_NAMESPACE = "todo"
+
+# Every cached list of todos (all, paginated)
+TODO_LIST_CACHE_TAG = "todo:list"
+
+# A single cached todo, formatted with its id
+TODO_CACHE_TAG = "todo:{id}"
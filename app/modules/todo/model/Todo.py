@@ -1,11 +1,12 @@
-from sqlalchemy import Column, Integer, String, Enum, DateTime, text
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Enum, DateTime, func
 from app.database import Base
 from ..constants import TodoSeverityEnum, TodoStatusEnum
 
 
 class Todo(Base):
     __tablename__ = "todos"
+    # Load server-generated columns with RETURNING on INSERT and UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -20,6 +21,13 @@ class Todo(Base):
         nullable=False,
         server_default=TodoStatusEnum.TODO.name,
     )
-    created_at = Column(DateTime, default=datetime.now)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
     deleted_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,3 +1,13 @@
-from .services import get_todo_repository, get_todo_service
+from .services import (
+    get_todo_repository,
+    get_todo_service,
+    get_async_todo_repository,
+    get_async_todo_service,
+)
 
-__all__ = ["get_todo_repository", "get_todo_service"]
+__all__ = [
+    "get_todo_repository",
+    "get_todo_service",
+    "get_async_todo_repository",
+    "get_async_todo_service",
+]
@@ -1,8 +1,15 @@
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from ..repository import TodoRepository
-from ..service import TodoService, TodoPolicy
+from app.core import (
+    AsyncCacheInvalidator,
+    CacheInvalidator,
+    get_async_cache_invalidator,
+    get_cache_invalidator,
+)
+from app.database import get_async_db, get_db
+from ..repository import AsyncTodoRepository, TodoRepository
+from ..service import AsyncTodoService, TodoService, TodoPolicy
 
 """
 This method is used to get the todo repository
@@ -16,12 +23,39 @@ def get_todo_repository(db: Session = Depends(get_db)) -> TodoRepository:
 
 """
 This method is used to get the todo service
-depends on the todo repository and policy
+depends on the todo repository, policy and cache invalidator
 """
 
 
 def get_todo_service(
     repository: TodoRepository = Depends(get_todo_repository),
     policy: TodoPolicy = Depends(),
+    cache: CacheInvalidator = Depends(get_cache_invalidator),
 ) -> TodoService:
-    return TodoService(repository, policy)
+    return TodoService(repository, policy, cache)
+
+
+"""
+This method is used to get the async todo repository
+depends on the async database session
+"""
+
+
+def get_async_todo_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncTodoRepository:
+    return AsyncTodoRepository(db)
+
+
+"""
+This method is used to get the async todo service, for async routes
+depends on the async todo repository, policy and cache invalidator
+"""
+
+
+def get_async_todo_service(
+    repository: AsyncTodoRepository = Depends(get_async_todo_repository),
+    policy: TodoPolicy = Depends(),
+    cache: AsyncCacheInvalidator = Depends(get_async_cache_invalidator),
+) -> AsyncTodoService:
+    return AsyncTodoService(repository, policy, cache)
@@ -0,0 +1,57 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Tuple
+from app.database import AsyncDatabaseRepository
+from .TodoRepository import filter_and_sort
+from ..model import Todo
+from ..schema import (
+    TodoCreate,
+    TodoUpdate,
+    TodoPaginationParams,
+)
+
+
+class AsyncTodoRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncDatabaseRepository(db, Todo)
+
+    async def create(self, todo: TodoCreate) -> Todo:
+        return await self.repository.create(todo)
+
+    async def create_many(
+        self, todos: List[TodoCreate], returning: bool = True
+    ) -> List[Todo] | List[int]:
+        return await self.repository.create_many(todos, returning=returning)
+
+    async def update(self, todo_id: int, todo_data: TodoUpdate) -> Todo | None:
+        return await self.repository.update(todo_id, todo_data)
+
+    async def delete(self, todo_id: int) -> bool:
+        return await self.repository.delete(todo_id)
+
+    async def get_by_id(self, todo_id: int) -> Todo | None:
+        return await self.repository.get_one(todo_id)
+
+    async def get_all(self) -> List[Todo]:
+        return await self.repository.all(self.repository.select())
+
+    async def get_paginated(
+        self, params: TodoPaginationParams
+    ) -> Tuple[List[Todo], int, int, int, int]:
+        statement = filter_and_sort(self.repository.select(), params)
+
+        # Paginate
+        total = await self.repository.count(statement)
+        items = await self.repository.all(
+            statement.offset((params.page - 1) * params.page_size).limit(
+                params.page_size
+            )
+        )
+
+        return (
+            items,  # List of items
+            total,  # Total items
+            params.page,  # Current page
+            params.page_size,  # Items per page
+            (total + params.page_size - 1) // params.page_size,  # Total pages
+        )
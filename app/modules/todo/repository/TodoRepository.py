@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import Select, desc, asc
 from typing import List, Tuple
 from app.core import BaseSortOrder
 from app.database import DatabaseRepository
@@ -11,6 +11,44 @@ from ..schema import (
 )
 
 
+def filter_and_sort(query: Query | Select, params: TodoPaginationParams):
+    """
+    Apply the pagination filters and sorting to a todo query. Works on sync
+    `Query` objects and async `select()` statements alike.
+    """
+    filters = {
+        "searches": {"title": params.title, "description": params.description},
+        "exact_matches": {"status": params.status, "severity": params.severity},
+        "date_ranges": {
+            "created_at": (params.created_at_from, params.created_at_to),
+            "updated_at": (params.updated_at_from, params.updated_at_to),
+        },
+    }
+
+    for field, value in filters["searches"].items():
+        if value:
+            query = query.filter(getattr(Todo, field).ilike(f"%{value}%"))
+
+    for field, value in filters["exact_matches"].items():
+        if value:
+            query = query.filter(getattr(Todo, field) == value)
+
+    for field, (date_from, date_to) in filters["date_ranges"].items():
+        if date_from:
+            query = query.filter(getattr(Todo, field) >= date_from)
+        if date_to:
+            query = query.filter(getattr(Todo, field) <= date_to)
+
+    # Sorting
+    sort_column = getattr(Todo, params.sort_by)
+    query = query.order_by(
+        desc(sort_column)
+        if params.sort_order == BaseSortOrder.DESC
+        else asc(sort_column)
+    )
+    return query
+
+
 class TodoRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -19,6 +57,14 @@ class TodoRepository:
     def create(self, todo: TodoCreate) -> Todo:
         return self.repository.create(todo)
 
+    def create_many(
+        self, todos: List[TodoCreate], returning: bool = True
+    ) -> List[Todo] | List[int]:
+        return self.repository.create_many(todos, returning=returning)
+
+    def import_many(self, todos: List[TodoCreate]) -> int:
+        return self.repository.copy_many(todos)
+
     def update(self, todo_id: int, todo_data: TodoUpdate) -> Todo | None:
         return self.repository.update(todo_id, todo_data)
 
@@ -34,38 +80,7 @@ class TodoRepository:
     def get_paginated(
         self, params: TodoPaginationParams
     ) -> Tuple[List[Todo], int, int, int, int]:
-        query = self.repository.query()
-
-        filters = {
-            "searches": {"title": params.title, "description": params.description},
-            "exact_matches": {"status": params.status, "severity": params.severity},
-            "date_ranges": {
-                "created_at": (params.created_at_from, params.created_at_to),
-                "updated_at": (params.updated_at_from, params.updated_at_to),
-            },
-        }
-
-        for field, value in filters["searches"].items():
-            if value:
-                query = query.filter(getattr(Todo, field).ilike(f"%{value}%"))
-
-        for field, value in filters["exact_matches"].items():
-            if value:
-                query = query.filter(getattr(Todo, field) == value)
-
-        for field, (date_from, date_to) in filters["date_ranges"].items():
-            if date_from:
-                query = query.filter(getattr(Todo, field) >= date_from)
-            if date_to:
-                query = query.filter(getattr(Todo, field) <= date_to)
-
-        # Sorting
-        sort_column = getattr(Todo, params.sort_by)
-        query = query.order_by(
-            desc(sort_column)
-            if params.sort_order == BaseSortOrder.DESC
-            else asc(sort_column)
-        )
+        query = filter_and_sort(self.repository.query(), params)
 
         # Paginate
         total = query.count()
@@ -1,5 +1,7 @@
 from .TodoRepository import TodoRepository
+from .AsyncTodoRepository import AsyncTodoRepository
 
 __all__ = [
     "TodoRepository",
+    "AsyncTodoRepository",
 ]
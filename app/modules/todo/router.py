@@ -2,6 +2,9 @@ from typing import List
 from fastapi import APIRouter, Depends, Request
 from app.core import BasePaginatedResponse, cache_response
 from .constants import (
+    TODO_CACHE_NAMESPACE,
+    TODO_LIST_CACHE_TAG,
+    TODO_CACHE_TAG,
     CREATE_TODO_DOC,
     GET_PAGINATED_TODOS_DOC,
     GET_TODO_DOC,
@@ -9,8 +12,8 @@ from .constants import (
     UPDATE_TODO_DOC,
     DELETE_TODO_DOC,
 )
-from .providers import get_todo_service
-from .service import TodoService
+from .providers import get_async_todo_service, get_todo_service
+from .service import AsyncTodoService, TodoService
 from .schema import (
     TodoCreate,
     TodoUpdate,
@@ -30,7 +33,16 @@ def create_todo(
 
 
 @router.get("/all", response_model=List[TodoResponse], description=GET_ALL_TODOS_DOC)
-@cache_response(expiry=10)
+@cache_response(
+    expiry=60,
+    single_flight=True,
+    stale_ttl=30,
+    tags=[TODO_LIST_CACHE_TAG],
+    namespace=TODO_CACHE_NAMESPACE,
+    stale_while_revalidate=True,
+    early_refresh=True,
+    middleware_hits=True,
+)
 def get_all_todos(
     request: Request, todo_service: TodoService = Depends(get_todo_service)
 ) -> List[TodoResponse]:
@@ -42,13 +54,23 @@ def get_all_todos(
     response_model=BasePaginatedResponse,
     description=GET_PAGINATED_TODOS_DOC,
 )
-@cache_response(expiry=10)
+@cache_response(
+    expiry=60,
+    single_flight=True,
+    stale_ttl=30,
+    local=True,
+    tags=[TODO_LIST_CACHE_TAG],
+    namespace=TODO_CACHE_NAMESPACE,
+    stale_while_revalidate=True,
+    early_refresh=True,
+    middleware_hits=True,
+)
 async def get_paginated_todos(
     request: Request,
     params: TodoPaginationParams = Depends(),
-    todo_service: TodoService = Depends(get_todo_service),
+    todo_service: AsyncTodoService = Depends(get_async_todo_service),
 ) -> BasePaginatedResponse:
-    response = todo_service.get_paginated(params)
+    response = await todo_service.get_paginated(params)
     # Convert SQLAlchemy models to dicts before returning
     response.items = [
         TodoResponse.model_validate(item).model_dump() for item in response.items
@@ -57,7 +79,15 @@ async def get_paginated_todos(
 
 
 @router.get("/{id}", response_model=TodoResponse, description=GET_TODO_DOC)
-@cache_response(expiry=10)
+@cache_response(
+    local=True,
+    tags=[TODO_CACHE_TAG],
+    namespace=TODO_CACHE_NAMESPACE,
+    negative_ttl=5,
+    adaptive_ttl=True,
+    min_ttl=10,
+    middleware_hits=True,
+)
 def get_todo(
     request: Request,
     id: int,
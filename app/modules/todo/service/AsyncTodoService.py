@@ -0,0 +1,111 @@
+from typing import List
+from app.core import AsyncCacheInvalidator, BasePaginatedResponse, NotFoundError
+from .TodoPolicy import TodoPolicy
+from ..constants import TODO_CACHE_TAG, TODO_LIST_CACHE_TAG
+from ..model import Todo
+from ..repository import AsyncTodoRepository
+from ..schema import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoPaginationParams,
+)
+
+
+class AsyncTodoService:
+    """
+    Async counterpart of `TodoService`, for async routes. Queries run on the
+    async engine, so they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncTodoRepository,
+        policy: TodoPolicy,
+        cache: AsyncCacheInvalidator | None = None,
+    ):
+        self.repository = repository
+        self.policy = policy
+        self.cache = cache
+
+    async def _invalidate_cache(self, todo_id: int | None = None) -> None:
+        """
+        Invalidate the cached todo lists and, if given, the cached todo
+        (including a cached not-found result for its id).
+        """
+        if self.cache is None:
+            return
+        tags = [TODO_LIST_CACHE_TAG]
+        if todo_id is not None:
+            tags.append(TODO_CACHE_TAG.format(id=todo_id))
+        await self.cache.invalidate(*tags)
+
+    async def create(self, todo_data: TodoCreate) -> Todo:
+        """
+        Create a new todo.
+        """
+        todo = await self.repository.create(todo_data)
+        await self._invalidate_cache(todo.id)
+        return todo
+
+    async def get_paginated(
+        self, params: TodoPaginationParams
+    ) -> BasePaginatedResponse[TodoResponse]:
+        """
+        Get paginated todos.
+        """
+        items, total, current_page, per_page, pages = (
+            await self.repository.get_paginated(params)
+        )
+
+        return BasePaginatedResponse(
+            items=items,
+            total=total,
+            current_page=current_page,
+            per_page=per_page,
+            pages=pages,
+            has_next=current_page < pages,
+            has_prev=current_page > 1,
+        )
+
+    async def get_by_id(self, todo_id: int) -> Todo:
+        """
+        Get a todo by its ID.
+        Raises NotFoundError if the todo does not exist.
+        """
+        todo = await self.repository.get_by_id(todo_id)
+        if todo is None:
+            raise NotFoundError(detail=f"Todo {todo_id} not found")
+        return todo
+
+    async def get_all(self) -> List[Todo]:
+        """
+        Get all todos.
+        """
+        return await self.repository.get_all()
+
+    async def update(self, todo_id: int, todo_data: TodoUpdate) -> Todo:
+        """
+        Update a todo by its ID.
+        If the status is being updated, validate the status and severity transition.
+        """
+        current_todo = await self.get_by_id(todo_id)
+        if todo_data.status is not None:
+            self.policy.validate_status_transition(
+                current_todo.status, todo_data.status
+            )
+        if todo_data.severity is not None:
+            self.policy.validate_severity_transition(
+                current_todo.severity, todo_data.severity
+            )
+        todo = await self.repository.update(todo_id, todo_data)
+        await self._invalidate_cache(todo_id)
+        return todo
+
+    async def delete(self, todo_id: int) -> None:
+        """
+        Delete a todo by its ID
+        """
+        await self.get_by_id(todo_id)
+        await self.repository.delete(todo_id)
+        await self._invalidate_cache(todo_id)
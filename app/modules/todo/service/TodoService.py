@@ -1,6 +1,7 @@
 from typing import List
-from app.core import BasePaginatedResponse
+from app.core import BasePaginatedResponse, CacheInvalidator, NotFoundError
 from .TodoPolicy import TodoPolicy
+from ..constants import TODO_CACHE_TAG, TODO_LIST_CACHE_TAG
 from ..model import Todo
 from ..repository import TodoRepository
 from ..schema import (
@@ -16,15 +17,31 @@ class TodoService:
         self,
         repository: TodoRepository,
         policy: TodoPolicy,
+        cache: CacheInvalidator | None = None,
     ):
         self.repository = repository
         self.policy = policy
+        self.cache = cache
+
+    def _invalidate_cache(self, todo_id: int | None = None) -> None:
+        """
+        Invalidate the cached todo lists and, if given, the cached todo
+        (including a cached not-found result for its id).
+        """
+        if self.cache is None:
+            return
+        tags = [TODO_LIST_CACHE_TAG]
+        if todo_id is not None:
+            tags.append(TODO_CACHE_TAG.format(id=todo_id))
+        self.cache.invalidate(*tags)
 
     def create(self, todo_data: TodoCreate) -> Todo:
         """
         Create a new todo.
         """
-        return self.repository.create(todo_data)
+        todo = self.repository.create(todo_data)
+        self._invalidate_cache(todo.id)
+        return todo
 
     def get_paginated(
         self, params: TodoPaginationParams
@@ -49,8 +66,12 @@ class TodoService:
     def get_by_id(self, todo_id: int) -> Todo:
         """
         Get a todo by its ID.
+        Raises NotFoundError if the todo does not exist.
         """
-        return self.repository.get_by_id(todo_id)
+        todo = self.repository.get_by_id(todo_id)
+        if todo is None:
+            raise NotFoundError(detail=f"Todo {todo_id} not found")
+        return todo
 
     def get_all(self) -> List[Todo]:
         """
@@ -72,7 +93,9 @@ class TodoService:
             self.policy.validate_severity_transition(
                 current_todo.severity, todo_data.severity
             )
-        return self.repository.update(todo_id, todo_data)
+        todo = self.repository.update(todo_id, todo_data)
+        self._invalidate_cache(todo_id)
+        return todo
 
     def delete(self, todo_id: int) -> None:
         """
@@ -80,3 +103,4 @@ class TodoService:
         """
         self.get_by_id(todo_id)
         self.repository.delete(todo_id)
+        self._invalidate_cache(todo_id)
@@ -1,4 +1,5 @@
 from .TodoPolicy import TodoPolicy
 from .TodoService import TodoService
+from .AsyncTodoService import AsyncTodoService
 
-__all__ = ["TodoPolicy", "TodoService"]
+__all__ = ["TodoPolicy", "TodoService", "AsyncTodoService"]
@@ -1,9 +1,14 @@
 import pytest
+import fakeredis
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.database import Base
+from app.core import cache_metrics
+from app.core import redis as redis_module
+from app.core.cache_warmup import hot_keys
 from app.core.config import AppSettings
-from unittest.mock import AsyncMock
+from app.core.redis import local_cache
 
 
 @pytest.fixture
@@ -30,8 +35,57 @@ def db_session():
 
 
 @pytest.fixture
-def mock_redis():
-    mock = AsyncMock()
-    mock.get.return_value = None
-    mock.set.return_value = True
-    return mock
+def redis_server():
+    # Shared in-memory server so the async and sync clients see the same data
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def mock_redis(redis_server):
+    return fakeredis.FakeAsyncRedis(server=redis_server)
+
+
+@pytest.fixture
+def mock_sync_redis(redis_server):
+    return fakeredis.FakeRedis(server=redis_server)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, mock_redis):
+    # Cache decorators use the fake server, starting from empty worker state
+    async def get_fake_redis():
+        return mock_redis
+
+    monkeypatch.setattr(redis_module, "get_redis", get_fake_redis)
+    local_cache.clear()
+    cache_metrics.reset()
+    hot_keys.clear()
+    yield mock_redis
+    hot_keys.clear()
+
+
+@pytest.fixture
+def make_request():
+    # Builds bare GET requests to call cached endpoints directly
+    def make(
+        path: str = "/todo/paginated",
+        query: str = "",
+        token: str | None = None,
+        **headers: str,
+    ) -> Request:
+        raw_headers = [
+            (name.encode(), value.encode()) for name, value in headers.items()
+        ]
+        if token:
+            raw_headers.append((b"authorization", f"Bearer {token}".encode()))
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": path,
+                "query_string": query.encode(),
+                "headers": raw_headers,
+            }
+        )
+
+    return make
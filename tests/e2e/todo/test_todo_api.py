@@ -3,15 +3,16 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.modules.todo.constants import TodoSeverityEnum, TodoStatusEnum
 from app.database.session import get_db
+from app.core.redis_pool import redis_clients, set_redis_clients
 
 
 @pytest.fixture
-def client(db_session, mock_redis):
-    app.state.redis = mock_redis
+def client(db_session, mock_redis, mock_sync_redis):
+    set_redis_clients(mock_redis, mock_sync_redis)
     app.dependency_overrides[get_db] = lambda: db_session
     yield TestClient(app)
     app.dependency_overrides.clear()
-    delattr(app.state, "redis")
+    redis_clients.clear()
 
 
 @pytest.fixture
@@ -103,6 +104,20 @@ def test_update(client: TestClient, todo_data, todo_update_data):
     assert update_res["updated_at"] != res["updated_at"]
 
 
+def test_update_invalidates_cached_todo(
+    client: TestClient, todo_data, todo_update_data
+):
+    create_response = client.post("/todo", json=todo_data)
+    id = get_json_format(create_response)["id"]
+
+    # Warm the cache, then update
+    client.get(f"/todo/{id}")
+    client.patch(f"/todo/{id}", json=todo_update_data)
+
+    get_response = client.get(f"/todo/{id}")
+    assert get_json_format(get_response)["title"] == todo_update_data["title"]
+
+
 def test_delete(client: TestClient, todo_data):
     create_response = client.post("/todo", json=todo_data)
     assert create_response.status_code == 200
@@ -109,3 +109,24 @@ def test_delete(db_session: Session, repository: TodoRepository, todo_details: d
 
     # Assertions
     assert response is True
+
+
+def test_create_many(repository: TodoRepository, todo_details: dict):
+    todos = [TodoCreate(**todo_details) for _ in range(5)]
+
+    created = repository.create_many(todos)
+    ids = repository.create_many(todos, returning=False)
+
+    assert len(created) == len(ids) == 5
+    assert all(todo.id is not None for todo in created)
+    assert extract_todo_dict(created[0]) == extract_todo_dict(todos[0])
+    assert all(isinstance(id, int) for id in ids)
+
+
+def test_import_many(repository: TodoRepository, todo_details: dict):
+    before = len(repository.get_all())
+
+    count = repository.import_many([TodoCreate(**todo_details) for _ in range(5)])
+
+    assert count == 5
+    assert len(repository.get_all()) == before + 5
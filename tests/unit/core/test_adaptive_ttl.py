@@ -0,0 +1,36 @@
+from app.core.adaptive_ttl import TtlStats, choose_ttl, record_write
+
+
+def test_never_written_tags_get_max_ttl():
+    assert choose_ttl([{}], now=1000.0, min_ttl=5, max_ttl=3600) == 3600
+
+
+def test_frequently_written_tags_get_short_ttl():
+    stats = {}
+    for now in (1000.0, 1010.0, 1020.0, 1030.0):
+        stats = record_write(stats, now)
+
+    assert stats["interval"] == 10.0
+    assert choose_ttl([stats], now=1031.0, min_ttl=2, max_ttl=3600) == 5
+    assert choose_ttl([stats], now=1031.0, min_ttl=8, max_ttl=3600) == 8
+
+
+def test_quiet_tags_earn_longer_ttl_again():
+    stats = record_write(record_write({}, 1000.0), 1010.0)
+
+    assert choose_ttl([stats], now=5000.0, min_ttl=5, max_ttl=3600) == 1995
+
+
+def test_ttl_stats_report_chosen_ttls():
+    ttl_stats = TtlStats()
+    ttl_stats.record("/todo/{id}", 10)
+    ttl_stats.record("/todo/{id}", 30)
+
+    assert ttl_stats.to_dict()["/todo/{id}"] == {
+        "count": 2,
+        "total": 40,
+        "min": 10,
+        "max": 30,
+        "last": 30,
+        "avg": 20.0,
+    }
@@ -0,0 +1,24 @@
+from app.core.cache_metrics import CacheMetrics, Histogram
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    for value in (0.005, 0.05, 0.05, 3.0):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {
+        "count": 4,
+        "sum": 3.105,
+        "buckets": {"0.01": 1, "0.1": 3, "+Inf": 4},
+    }
+
+
+def test_routes_are_tracked_separately():
+    metrics = CacheMetrics()
+    metrics.route("/todo/{id}").hits += 1
+    metrics.route("/todo/paginated").misses += 1
+
+    report = metrics.to_dict()
+    assert report["/todo/{id}"]["hits"] == 1
+    assert report["/todo/{id}"]["misses"] == 0
+    assert report["/todo/paginated"]["misses"] == 1
@@ -0,0 +1,164 @@
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.security import OAuth2PasswordBearer
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError
+from app.core import cache_metrics
+from app.core import redis as redis_module
+from app.core.cache_middleware import CacheMiddleware
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.redis import cache_response
+from app.modules.todo.schema import TodoPaginationParams
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+@pytest.fixture
+def resolved():
+    return []
+
+
+@pytest.fixture
+def client(fake_redis, resolved):
+    def get_service():
+        resolved.append("service")
+        return "service"
+
+    app = FastAPI()
+    app.add_middleware(CacheMiddleware)
+
+    @app.get("/todo/paginated")
+    @cache_response(expiry=60, middleware_hits=True)
+    async def get_paginated(
+        request: Request,
+        params: TodoPaginationParams = Depends(),
+        service: str = Depends(get_service),
+    ):
+        return {"page": params.page}
+
+    @app.get("/todo/{id}")
+    @cache_response(expiry=60)
+    async def get_todo(request: Request, id: int, service=Depends(get_service)):
+        return {"id": id}
+
+    @app.get("/me")
+    @cache_response(expiry=60, middleware_hits=True)
+    async def get_me(request: Request, token: str = Depends(oauth2_scheme)):
+        return {"token": token}
+
+    return TestClient(app)
+
+
+def test_hits_skip_dependency_resolution(client, resolved):
+    first = client.get("/todo/paginated?page=2&sort_order=desc")
+    second = client.get("/todo/paginated?page=2")
+
+    assert first.json() == second.json() == {"page": 2}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert resolved == ["service"]
+    assert cache_metrics.to_dict()["/todo/paginated"]["middleware_hits"] == 1
+
+
+def test_invalid_queries_reach_the_endpoint(client, resolved):
+    response = client.get("/todo/paginated?page=0")
+
+    assert response.status_code == 422
+
+
+def test_routes_opt_in(client, resolved):
+    client.get("/todo/1")
+    response = client.get("/todo/1")
+
+    assert response.json() == {"id": 1}
+    assert resolved == ["service", "service"]
+    assert cache_metrics.to_dict()["/todo/{id}"]["hits"] == 1
+
+
+def test_secured_routes_are_not_answered_early(client):
+    client.get("/me", headers={"Authorization": "Bearer token"})
+    anonymous = client.get("/me")
+
+    # The entry stored for the first caller is not served without a token
+    assert anonymous.status_code == 401
+
+
+def test_misses_are_looked_up_once(client, fake_redis, monkeypatch):
+    gets = []
+    get = fake_redis.get
+
+    async def counting_get(key):
+        gets.append(key)
+        return await get(key)
+
+    monkeypatch.setattr(fake_redis, "get", counting_get)
+
+    client.get("/todo/paginated?page=2")
+
+    assert gets == ["/todo/paginated?page=2"]
+    assert cache_metrics.to_dict()["/todo/paginated"]["misses"] == 1
+
+
+def test_redis_failures_trip_the_breaker_once(client, fake_redis, monkeypatch):
+    breaker = CircuitBreaker("redis", failure_threshold=5, reset_timeout=60)
+    monkeypatch.setattr(redis_module, "redis_breaker", breaker)
+    gets = []
+
+    async def failing_get(key):
+        gets.append(key)
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr(fake_redis, "get", failing_get)
+
+    response = client.get("/todo/paginated?page=2")
+
+    assert response.json() == {"page": 2}
+    assert len(gets) == 1
+    assert breaker.failures == 1
+
+
+def make_included_app(resolved, **include_options) -> FastAPI:
+    def get_service():
+        resolved.append("service")
+        return "service"
+
+    router = APIRouter(prefix="/todo")
+    nested = APIRouter(prefix="/lists")
+
+    @router.get("/{id}")
+    @cache_response(expiry=60, middleware_hits=True)
+    async def get_todo(request: Request, id: int, service=Depends(get_service)):
+        return {"id": id}
+
+    @nested.get("/{id}")
+    @cache_response(expiry=60, middleware_hits=True)
+    async def get_list(request: Request, id: int, service=Depends(get_service)):
+        return {"list": id}
+
+    router.include_router(nested)
+    app = FastAPI()
+    app.add_middleware(CacheMiddleware)
+    app.include_router(router, **include_options)
+    return app
+
+
+def test_included_routers_are_answered_early(fake_redis, resolved):
+    client = TestClient(make_included_app(resolved))
+
+    for path in ("/todo/1", "/todo/1", "/todo/lists/2", "/todo/lists/2"):
+        client.get(path)
+
+    assert resolved == ["service", "service"]
+    assert (
+        sum(route["middleware_hits"] for route in cache_metrics.to_dict().values()) == 2
+    )
+
+
+def test_router_security_dependencies_are_respected(fake_redis, resolved):
+    client = TestClient(
+        make_included_app(resolved, dependencies=[Depends(oauth2_scheme)])
+    )
+
+    client.get("/todo/1", headers={"Authorization": "Bearer token"})
+    anonymous = client.get("/todo/1")
+
+    assert anonymous.status_code == 401
@@ -0,0 +1,150 @@
+import asyncio
+import jwt
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from app.core import NotFoundError, get_redis
+from app.core import cache_namespaces
+from app.core.cache_namespaces import (
+    flush_namespace,
+    get_cache_memory,
+    namespace_memory,
+    trim_namespace,
+    trim_namespaces_periodically,
+)
+from app.core.config import app_settings
+from app.core.redis import cache_response, namespaces
+from app.main import app
+
+
+def fill(redis, namespace: str, count: int, size: int = 100) -> None:
+    async def run():
+        for id in range(count):
+            await redis.set(f"{namespace}:/{namespace}/{id}", b"x" * size, ex=60 + id)
+
+    asyncio.run(run())
+
+
+def test_entries_are_namespaced(fake_redis, make_request):
+    @cache_response(expiry=60, namespace="todo")
+    async def get_todo(request: Request, id: int):
+        return {"id": id}
+
+    asyncio.run(get_todo(make_request("/todo/1"), id=1))
+
+    assert asyncio.run(fake_redis.exists("todo:/todo/1")) == 1
+    assert "todo" in namespaces
+
+
+def test_memory_is_reported_per_namespace(fake_redis, monkeypatch):
+    monkeypatch.setattr(app_settings, "cache_namespace_budgets", {"auth": 1000})
+    fill(fake_redis, "todo", 20)
+    fill(fake_redis, "auth", 5)
+
+    todo = asyncio.run(namespace_memory(fake_redis, "todo", sample_size=5))
+    report = asyncio.run(get_cache_memory(fake_redis))
+
+    assert todo["keys"] == 20
+    assert todo["sampled"] == 5
+    # Sizes fall back to key and value length without MEMORY USAGE
+    assert 20 * 100 < todo["estimated_bytes"] < 20 * 120
+    assert report["auth"]["keys"] == 5
+    assert report["auth"]["budget_bytes"] == 1000
+
+
+def test_trim_evicts_down_to_the_budget(fake_redis):
+    fill(fake_redis, "todo", 20)
+
+    evicted = asyncio.run(trim_namespace(fake_redis, "todo", 1000, sample_size=20))
+    remaining = asyncio.run(namespace_memory(fake_redis, "todo", sample_size=20))
+
+    assert remaining["estimated_bytes"] <= 1000
+    assert len(evicted) + remaining["keys"] == 20
+    # Without OBJECT, the entries closest to expiring go first
+    assert "todo:/todo/0" in evicted
+    assert "todo:/todo/19" not in evicted
+
+
+def test_trim_skips_keys_expired_since_sampling(fake_redis, monkeypatch):
+    fill(fake_redis, "todo", 20)
+
+    async def idletime(infotype, key):
+        # OBJECT answers nil for a key that expired after SCAN returned it
+        return None if key.endswith(b"/0") else 10
+
+    monkeypatch.setattr(fake_redis, "object", idletime, raising=False)
+
+    evicted = asyncio.run(trim_namespace(fake_redis, "todo", 1000, sample_size=20))
+
+    assert evicted
+    assert "todo:/todo/0" not in evicted
+
+
+def test_trimming_survives_unexpected_errors(monkeypatch):
+    calls = []
+
+    async def trim(redis):
+        calls.append(1)
+        if len(calls) == 1:
+            raise TypeError("unexpected")
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(cache_namespaces, "trim_namespaces", trim)
+    monkeypatch.setattr(app_settings, "cache_trim_interval", 0)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(trim_namespaces_periodically(None))
+
+    assert len(calls) == 2
+
+
+def test_flush_only_touches_its_namespace(fake_redis, monkeypatch):
+    monkeypatch.setattr(app_settings, "cache_namespace_budgets", {"todo": 10**9})
+    fill(fake_redis, "todo", 1200)
+    fill(fake_redis, "auth", 3)
+
+    deleted = asyncio.run(flush_namespace(fake_redis, "todo"))
+
+    assert deleted == 1200
+    assert asyncio.run(fake_redis.dbsize()) == 3
+
+
+def test_flush_rejects_unknown_namespaces(fake_redis, monkeypatch):
+    monkeypatch.setattr(app_settings, "cache_namespace_budgets", {"t*": 10**9})
+    fill(fake_redis, "todo", 3)
+    asyncio.run(fake_redis.set("lock:todo", b"1"))
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(flush_namespace(fake_redis, "*"))
+    # Glob characters in a known namespace only match themselves
+    assert asyncio.run(flush_namespace(fake_redis, "t*")) == 0
+    assert asyncio.run(fake_redis.dbsize()) == 4
+
+
+def test_cache_administration_requires_the_admin_role(fake_redis, monkeypatch):
+    monkeypatch.setattr(app_settings, "cache_namespace_budgets", {"todo": 10**9})
+    app.dependency_overrides[get_redis] = lambda: fake_redis
+    client = TestClient(app)
+
+    def headers(role: str | None) -> dict:
+        if not role:
+            return {}
+        token = jwt.encode(
+            {"sub": "alice", "role": role, "aud": app_settings.app_audience},
+            app_settings.jwt_secret_key,
+            algorithm=app_settings.jwt_algorithm,
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    def flush(role: str | None = None):
+        return client.delete("/internal/cache/todo", headers=headers(role)).status_code
+
+    def memory(role: str | None = None):
+        return client.get("/internal/cache-memory", headers=headers(role)).status_code
+
+    try:
+        assert flush() == memory() == 401
+        assert flush("user") == memory("user") == 403
+        assert flush("admin") == memory("admin") == 200
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import jwt
+import pytest
+from fastapi import Request
+from app.core.config import app_settings
+from app.core.cache_vary import get_principal
+from app.core.redis import cache_response
+
+
+def make_token(sub: str, role: str = "user", secret: str | None = None) -> str:
+    return jwt.encode(
+        {"sub": sub, "role": role, "aud": app_settings.app_audience},
+        secret or app_settings.jwt_secret_key,
+        algorithm=app_settings.jwt_algorithm,
+    )
+
+
+def read(response) -> dict:
+    return json.loads(response.body)
+
+
+def test_subject_keeps_entries_private(fake_redis, make_request):
+    calls = []
+
+    @cache_response(expiry=60, vary_on=["subject"])
+    async def get_todos(request: Request):
+        calls.append(request)
+        return {"owner": get_principal(request).get("sub")}
+
+    async def run():
+        alice = await get_todos(make_request("/todo/all", token=make_token("alice")))
+        bob = await get_todos(make_request("/todo/all", token=make_token("bob")))
+        alice_again = await get_todos(
+            make_request("/todo/all", token=make_token("alice"))
+        )
+        return alice, bob, alice_again
+
+    alice, bob, alice_again = asyncio.run(run())
+
+    assert read(alice) == read(alice_again) == {"owner": "alice"}
+    assert read(bob) == {"owner": "bob"}
+    assert len(calls) == 2
+    assert asyncio.run(fake_redis.exists("user:{alice}:/todo/all")) == 1
+
+
+def test_forged_tokens_are_anonymous(fake_redis, make_request):
+    @cache_response(expiry=60, vary_on=["subject"])
+    async def get_todos(request: Request):
+        return {"owner": get_principal(request).get("sub")}
+
+    forged = make_token("alice", secret="not-the-secret-key-at-all-really")
+    response = asyncio.run(get_todos(make_request("/todo/all", token=forged)))
+
+    assert read(response) == {"owner": None}
+    assert asyncio.run(fake_redis.keys("user:*")) == []
+
+
+def test_role_and_headers_share_entries_per_value(fake_redis, make_request):
+    calls = []
+
+    @cache_response(expiry=60, vary_on=["role", "header:Accept-Language"])
+    async def get_todos(request: Request):
+        calls.append(request)
+        return {"count": len(calls)}
+
+    async def run():
+        for sub, role, language in [
+            ("alice", "admin", "en"),
+            ("bob", "admin", "en"),
+            ("carol", "user", "en"),
+            ("dave", "admin", "de"),
+        ]:
+            await get_todos(
+                make_request(
+                    "/todo/all",
+                    token=make_token(sub, role),
+                    **{"accept-language": language},
+                )
+            )
+
+    asyncio.run(run())
+
+    assert len(calls) == 3
+    assert (
+        asyncio.run(
+            fake_redis.exists("/todo/all#header%3Aaccept-language=en&role=admin")
+        )
+        == 1
+    )
+
+
+def test_user_key_budget_evicts_oldest_entries(fake_redis, make_request):
+    @cache_response(expiry=60, vary_on=["subject"], user_key_budget=2)
+    async def get_todo(request: Request, id: int):
+        return {"id": id}
+
+    async def run():
+        token = make_token("alice")
+        for id in range(3):
+            await get_todo(make_request(f"/todo/{id}", token=token), id=id)
+
+    asyncio.run(run())
+
+    assert asyncio.run(fake_redis.exists("user:{alice}:/todo/0")) == 0
+    assert (
+        asyncio.run(fake_redis.exists("user:{alice}:/todo/1", "user:{alice}:/todo/2"))
+        == 2
+    )
+
+
+def test_unknown_vary_on_is_rejected():
+    with pytest.raises(ValueError):
+        cache_response(vary_on=["cookie"])
@@ -0,0 +1,66 @@
+import asyncio
+from fastapi import FastAPI, Request
+from app.core.cache_warmup import (
+    HotKeys,
+    hot_keys,
+    load_hot_keys,
+    save_hot_keys,
+    warm_cache,
+)
+from app.core.redis import cache_response
+
+
+def make_app(delay: float = 0) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    @cache_response(expiry=60)
+    async def get_items(request: Request, page: int = 1):
+        await asyncio.sleep(delay)
+        return {"page": page}
+
+    return app
+
+
+def test_warm_cache_fills_the_cache(fake_redis):
+    result = asyncio.run(
+        warm_cache(make_app(), ["/items", "/items?page=2"], timeout=5, concurrency=2)
+    )
+
+    assert result["warmed"] == 2
+    assert asyncio.run(fake_redis.exists("/items", "/items?page=2")) == 2
+
+
+def test_warm_cache_stops_at_the_time_budget(fake_redis):
+    result = asyncio.run(
+        warm_cache(make_app(delay=1), ["/items"], timeout=0.05, concurrency=2)
+    )
+
+    assert result == {**result, "warmed": 0, "cancelled": 1}
+    assert asyncio.run(fake_redis.exists("/items")) == 0
+
+
+def test_hot_keys_survive_a_restart(fake_redis):
+    app = make_app()
+    asyncio.run(warm_cache(app, ["/items?page=2"], timeout=5, concurrency=1))
+    for _ in range(3):
+        hot_keys.record("/items?page=3")
+
+    asyncio.run(save_hot_keys(fake_redis, n=10))
+
+    assert asyncio.run(load_hot_keys(fake_redis, 1)) == ["/items?page=3"]
+    assert asyncio.run(load_hot_keys(fake_redis, 10)) == [
+        "/items?page=3",
+        "/items?page=2",
+    ]
+
+
+def test_hot_keys_forget_the_long_tail():
+    keys = HotKeys(max_size=2)
+    keys.record("/a")
+    keys.record("/a")
+    for path in ["/b", "/c", "/d", "/e"]:
+        keys.record(path)
+
+    assert len(keys.most_common(10)) <= 4
+    assert keys.most_common(1) == [("/a", 2)]
@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock
+from app.core.circuit_breaker import CircuitBreaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure()
+    assert breaker.allow() is True
+
+    breaker.record_failure()
+    assert breaker.allow() is False
+    assert breaker.to_dict() == {"state": "open", "failures": 2, "times_opened": 1}
+
+
+def test_success_resets_failures():
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.allow() is True
+
+
+def test_half_open_after_reset_timeout_without_probe():
+    breaker = CircuitBreaker("redis", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow() is True
+    assert breaker.state == "half_open"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_background_probe_closes_breaker():
+    breaker = CircuitBreaker("redis", failure_threshold=1, reset_timeout=0.01)
+    client = AsyncMock()
+    client.ping.side_effect = [ConnectionError(), True]
+
+    async def run():
+        breaker.record_failure(client)
+        assert breaker.allow() is False
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+
+    assert breaker.state == "closed"
+    assert client.ping.call_count == 2
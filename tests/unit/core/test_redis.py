@@ -0,0 +1,486 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+import fakeredis
+from redis.exceptions import RedisError
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+from app.core import redis as redis_module
+from app.core import NotFoundError, cache_metrics
+from app.core.config import app_settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.local_cache import LocalCache
+from app.core.redis import (
+    CacheEntry,
+    CacheInvalidator,
+    build_cache_key,
+    cache_response,
+    listen_for_invalidations,
+    local_cache,
+)
+from app.modules.todo.schema import TodoPaginationParams
+
+
+def read(response) -> dict:
+    return json.loads(response.body)
+
+
+def stale_entry(data: dict) -> bytes:
+    return CacheEntry(
+        body=json.dumps(data).encode(),
+        status_code=200,
+        media_type="application/json",
+        expires_at=0,
+    ).to_bytes()
+
+
+def test_cache_hit_skips_handler(fake_redis, make_request):
+    calls = []
+
+    @cache_response(expiry=10)
+    async def handler(request: Request):
+        calls.append(1)
+        return {"value": len(calls)}
+
+    async def run():
+        first = await handler(make_request(query="page=1"))
+        second = await handler(make_request(query="page=1"))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert read(first) == read(second) == {"value": 1}
+    assert len(calls) == 1
+
+
+def test_single_flight_computes_once(fake_redis, make_request):
+    calls = []
+
+    @cache_response(expiry=10, single_flight=True, lock_wait=2)
+    async def handler(request: Request):
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"value": len(calls)}
+
+    async def run():
+        return await asyncio.gather(
+            *(handler(make_request(query="page=1")) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(read(result) == {"value": 1} for result in results)
+
+
+def test_single_flight_serves_stale_while_locked(fake_redis, make_request):
+    @cache_response(expiry=1, single_flight=True, stale_ttl=30)
+    async def handler(request: Request):
+        return {"value": "fresh"}
+
+    async def run():
+        await handler(make_request(query="page=1"))
+        # Expire the entry logically and hold the lock as another worker would
+        await fake_redis.set(
+            "/todo/paginated?page=1",
+            stale_entry({"value": "stale"}),
+            30,
+        )
+        await fake_redis.set("lock:/todo/paginated?page=1", "other-worker", px=5000)
+        return await handler(make_request(query="page=1"))
+
+    assert read(asyncio.run(run())) == {"value": "stale"}
+
+
+def test_single_flight_lock_expires(fake_redis, make_request):
+    @cache_response(expiry=10, single_flight=True, lock_wait=0.2)
+    async def handler(request: Request):
+        return {"value": "computed"}
+
+    async def run():
+        # A crashed holder leaves a lock behind that expires on its own
+        await fake_redis.set("lock:/todo/paginated?page=1", "crashed", px=100)
+        return await handler(make_request(query="page=1"))
+
+    assert read(asyncio.run(run())) == {"value": "computed"}
+
+
+def test_local_tier_skips_redis(fake_redis, make_request):
+    @cache_response(expiry=10, local=True)
+    async def handler(request: Request):
+        return {"value": "computed"}
+
+    async def run():
+        await handler(make_request(query="page=1"))
+        # Drop the Redis copy: the worker cache must still answer
+        await fake_redis.flushall()
+        return await handler(make_request(query="page=1"))
+
+    assert read(asyncio.run(run())) == {"value": "computed"}
+    assert local_cache.stats.hits >= 1
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats.evictions == 1
+
+
+def test_invalidation_message_evicts_other_workers(fake_redis):
+    local_cache.set("/todo/1", {"id": 1})
+
+    async def run():
+        listener = asyncio.create_task(listen_for_invalidations(fake_redis))
+        await asyncio.sleep(0.05)
+        await fake_redis.publish(
+            app_settings.cache_invalidation_channel,
+            json.dumps({"origin": "other-worker", "keys": ["/todo/1"]}),
+        )
+        await asyncio.sleep(0.05)
+        listener.cancel()
+
+    asyncio.run(run())
+
+    assert local_cache.get("/todo/1") == (False, None)
+
+
+def test_tags_invalidate_only_tagged_entries(fake_redis, mock_sync_redis, make_request):
+    sync_redis = mock_sync_redis
+
+    @cache_response(expiry=60, tags=["todo:{id}"])
+    async def get_todo(request: Request, id: int):
+        return {"id": id}
+
+    async def warm():
+        await get_todo(make_request("/todo/1", ""), id=1)
+        await get_todo(make_request("/todo/2", ""), id=2)
+
+    asyncio.run(warm())
+
+    assert CacheInvalidator(sync_redis).invalidate("todo:1") == 1
+    assert sync_redis.exists("/todo/1") == 0
+    assert sync_redis.exists("/todo/2") == 1
+    assert sync_redis.exists("tag:todo:1") == 0
+
+
+def test_stale_while_revalidate_refreshes_in_background(fake_redis):
+    events = []
+    app = FastAPI()
+
+    def get_session():
+        session = {"open": True}
+        yield session
+        events.append("close")
+        session["open"] = False
+
+    @app.get("/todo/paginated")
+    @cache_response(expiry=1, stale_ttl=30, stale_while_revalidate=True)
+    async def handler(request: Request, session: dict = Depends(get_session)):
+        events.append("query" if session["open"] else "query on closed session")
+        return {"value": events.count("query")}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://t"
+        ) as client:
+            await client.get("/todo/paginated?page=1")
+            await fake_redis.set(
+                "/todo/paginated?page=1",
+                stale_entry({"value": "stale"}),
+                30,
+            )
+            served = await client.get("/todo/paginated?page=1")
+            await asyncio.gather(*redis_module.background_refreshes)
+            return served, await client.get("/todo/paginated?page=1")
+
+    served, refreshed = asyncio.run(run())
+
+    assert served.json() == {"value": "stale"}
+    assert refreshed.json() == {"value": 2}
+    # The refresh resolved a session of its own
+    assert "query on closed session" not in events
+    assert events.count("query") == 2
+    assert events.count("close") == 4
+
+
+def test_hit_serves_rendered_response_model_bytes(fake_redis):
+    class Item(BaseModel):
+        id: int
+
+    calls = []
+    app = FastAPI()
+
+    @app.get("/items/{id}", response_model=Item)
+    @cache_response(expiry=10)
+    async def get_item(request: Request, id: int):
+        calls.append(1)
+        return {"id": id, "secret": "not in the response model"}
+
+    client = TestClient(app)
+    first = client.get("/items/1")
+    second = client.get("/items/1")
+
+    assert first.json() == second.json() == {"id": 1}
+    assert second.headers["content-type"] == "application/json"
+    assert len(calls) == 1
+
+
+def test_rendering_honours_response_model_options(fake_redis):
+    class Item(BaseModel):
+        id: int
+        item_name: str = Field(alias="itemName")
+        note: str | None = None
+
+    app = FastAPI()
+
+    @app.get("/items/{id}", response_model=Item, response_model_exclude_none=True)
+    @cache_response(expiry=10)
+    async def get_item(request: Request, id: int):
+        return {"id": id, "itemName": "A todo"}
+
+    client = TestClient(app)
+    first = client.get("/items/1")
+    second = client.get("/items/1")
+
+    assert first.json() == second.json() == {"id": 1, "itemName": "A todo"}
+
+
+def test_large_entries_are_served_compressed(fake_redis):
+    app = FastAPI()
+
+    @app.get("/items")
+    @cache_response(expiry=10)
+    async def get_items(request: Request):
+        return [{"id": i, "title": "A todo title"} for i in range(200)]
+
+    client = TestClient(app)
+    client.get("/items")
+    compressed = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert compressed.json() == plain.json()
+    assert redis_module.compression_stats.to_dict()["bytes_saved"] > 0
+
+
+def test_matching_etag_gets_not_modified(fake_redis):
+    app = FastAPI()
+
+    @app.get("/items/{id}")
+    @cache_response(expiry=10)
+    async def get_item(request: Request, id: int):
+        return {"id": id}
+
+    client = TestClient(app)
+    etag = client.get("/items/1").headers["etag"]
+    not_modified = client.get("/items/1", headers={"If-None-Match": etag})
+    changed = client.get("/items/1", headers={"If-None-Match": '"outdated"'})
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert changed.status_code == 200
+
+
+def test_equivalent_queries_share_a_cache_key(make_request):
+    params = TodoPaginationParams(page=1, page_size=10, status="TODO")
+    keys = {
+        build_cache_key(make_request(query=query), {"params": params})
+        for query in (
+            "page=1&page_size=10&status=TODO",
+            "status=TODO&page_size=10",
+            "status=TODO&page=1",
+        )
+    }
+
+    assert keys == {"/todo/paginated?status=TODO"}
+
+
+def test_sync_handlers_run_off_the_event_loop(fake_redis, make_request):
+    threads = []
+
+    @cache_response(expiry=10)
+    def handler(request: Request):
+        threads.append(threading.current_thread().name)
+        return {"value": "computed"}
+
+    response = asyncio.run(handler(make_request(query="page=1")))
+
+    assert read(response) == {"value": "computed"}
+    assert threads[0].startswith("cache-handler")
+    assert redis_module.executor_stats.tasks >= 1
+
+
+def test_not_found_is_cached_for_negative_ttl(fake_redis, make_request):
+    calls = []
+
+    @cache_response(expiry=10, negative_ttl=5)
+    async def handler(request: Request):
+        calls.append(1)
+        raise NotFoundError(detail="Todo 404 not found")
+
+    async def run():
+        first = await handler(make_request("/todo/404", ""))
+        second = await handler(make_request("/todo/404", ""))
+        return first, second, await fake_redis.ttl("/todo/404")
+
+    first, second, ttl = asyncio.run(run())
+
+    assert first.status_code == second.status_code == 404
+    assert read(second) == {"detail": "Todo 404 not found"}
+    assert len(calls) == 1
+    assert 0 < ttl <= 5
+
+
+def test_cached_errors_ignore_if_none_match(fake_redis):
+    app = FastAPI()
+
+    @app.get("/todo/{id}")
+    @cache_response(expiry=10, negative_ttl=5)
+    async def get_todo(request: Request, id: int):
+        raise NotFoundError(detail=f"Todo {id} not found")
+
+    client = TestClient(app)
+    client.get("/todo/404")
+    response = client.get("/todo/404", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+
+def test_early_refresh_recomputes_before_expiry(fake_redis, monkeypatch, make_request):
+    calls = []
+
+    @cache_response(expiry=60, early_refresh=True)
+    async def handler(request: Request):
+        calls.append(1)
+        return {"value": len(calls)}
+
+    async def run():
+        await handler(make_request(query="page=1"))
+        await fake_redis.set(
+            "/todo/paginated?page=1",
+            CacheEntry(
+                body=b'{"value": "cached"}',
+                status_code=200,
+                media_type="application/json",
+                expires_at=time.time() + 1,
+                delta=2.0,
+            ).to_bytes(),
+            60,
+        )
+        return await handler(make_request(query="page=1"))
+
+    # An unlucky draw refreshes an entry that took longer to compute than
+    # it has left to live
+    monkeypatch.setattr(redis_module.random, "random", lambda: 0.01)
+
+    assert read(asyncio.run(run())) == {"value": 2}
+    assert (
+        CacheEntry(
+            body=b"", status_code=200, media_type="", expires_at=time.time() + 60
+        ).expires_early(beta=1.0)
+        is False
+    )
+
+
+def test_adaptive_ttl_shortens_for_frequently_invalidated_tags(
+    fake_redis, mock_sync_redis, make_request
+):
+    invalidator = CacheInvalidator(mock_sync_redis)
+
+    @cache_response(tags=["todo:{id}"], adaptive_ttl=True, min_ttl=1, max_ttl=600)
+    async def get_todo(request: Request, id: int):
+        return {"id": id}
+
+    async def ttl_of(id: int) -> int:
+        await get_todo(make_request(f"/todo/{id}", ""), id=id)
+        return await fake_redis.ttl(f"/todo/{id}")
+
+    for _ in range(3):
+        invalidator.invalidate("todo:1")
+
+    assert asyncio.run(ttl_of(1)) <= 1
+    assert asyncio.run(ttl_of(2)) == 600
+
+
+def test_metrics_are_recorded_per_route_template(fake_redis):
+    app = FastAPI()
+
+    @app.get("/items/{id}")
+    @cache_response(expiry=10)
+    async def get_item(request: Request, id: int):
+        return {"id": id}
+
+    client = TestClient(app)
+    for id in (1, 2, 1, 2):
+        client.get(f"/items/{id}")
+
+    metrics = cache_metrics.to_dict()["/items/{id}"]
+    assert metrics["hits"] == 2
+    assert metrics["misses"] == 2
+    assert metrics["hit_ratio"] == 0.5
+    assert metrics["bytes_served"] == 2 * len(b'{"id": 1}')
+    assert metrics["redis_get_latency"]["count"] == 4
+    assert metrics["recompute_latency"]["count"] == 2
+
+
+def test_redis_outage_degrades_to_uncached(monkeypatch, make_request):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout=60)
+
+    async def get_fake_redis():
+        return redis
+
+    monkeypatch.setattr(redis_module, "get_redis", get_fake_redis)
+    monkeypatch.setattr(redis_module, "redis_breaker", breaker)
+    calls = []
+
+    @cache_response(expiry=10)
+    async def handler(request: Request):
+        calls.append(1)
+        return {"value": "uncached"}
+
+    async def run():
+        return [await handler(make_request(query="page=1")) for _ in range(3)]
+
+    results = asyncio.run(run())
+
+    assert results == [{"value": "uncached"}] * 3
+    assert len(calls) == 3
+    assert breaker.state == "open"
+
+
+def test_failing_writes_open_the_breaker(fake_redis, monkeypatch, make_request):
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout=60)
+    monkeypatch.setattr(redis_module, "redis_breaker", breaker)
+
+    async def failing_store(*args):
+        raise RedisError("READONLY You can't write against a read only replica")
+
+    monkeypatch.setattr(redis_module, "store_entry", failing_store)
+
+    @cache_response(expiry=10)
+    async def handler(request: Request):
+        return {"value": "uncached"}
+
+    async def run():
+        return [await handler(make_request(query="page=1")) for _ in range(2)]
+
+    results = asyncio.run(run())
+
+    assert [read(result) for result in results] == [{"value": "uncached"}] * 2
+    assert breaker.state == "open"
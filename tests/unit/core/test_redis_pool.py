@@ -0,0 +1,49 @@
+import asyncio
+from app.core.config import AppSettings
+from app.core.redis_pool import (
+    close_redis_clients,
+    create_redis,
+    create_sync_redis,
+    get_redis,
+    get_redis_pool_stats,
+    get_sync_redis,
+    open_redis_clients,
+)
+
+
+def test_clients_are_built_from_settings():
+    settings = AppSettings(
+        redis_host="cache",
+        redis_max_connections=7,
+        redis_socket_timeout=0.5,
+        redis_health_check_interval=10,
+    )
+
+    for client in (create_redis(settings), create_sync_redis(settings)):
+        pool = client.connection_pool
+        assert pool.max_connections == 7
+        assert pool.connection_kwargs["host"] == "cache"
+        assert pool.connection_kwargs["socket_timeout"] == 0.5
+        assert pool.connection_kwargs["health_check_interval"] == 10
+
+
+def test_clients_are_opened_once_and_report_pool_stats():
+    async def run():
+        await open_redis_clients(AppSettings(redis_max_connections=4))
+        redis, sync_redis = await get_redis(), get_sync_redis()
+        stats = get_redis_pool_stats()
+        # Same clients on every call
+        assert await get_redis() is redis
+        assert get_sync_redis() is sync_redis
+        await close_redis_clients()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats["async"] == {
+        "max_connections": 4,
+        "in_use": 0,
+        "idle": 0,
+        "utilisation": 0.0,
+    }
+    assert stats["sync"]["max_connections"] == 4
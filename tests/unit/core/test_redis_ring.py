@@ -0,0 +1,85 @@
+import asyncio
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError
+from fastapi import Request
+from app.core import redis as redis_module
+from app.core.redis import CacheInvalidator, cache_response
+from app.core.redis_ring import HashRing, ShardedRedis, hash_key
+
+NODES = ["redis-1:6379", "redis-2:6379", "redis-3:6379"]
+
+
+def test_hash_tags_keep_related_keys_together():
+    ring = HashRing(NODES)
+
+    assert hash_key("{todo}:list") == "todo"
+    assert ring.get_node("{todo}:list") == ring.get_node("{todo}:1")
+
+
+def test_removing_a_node_remaps_only_its_keys():
+    ring = HashRing(NODES)
+    keys = [f"/todo/{id}" for id in range(3000)]
+    before = {key: ring.get_node(key) for key in keys}
+
+    ring.remove_node("redis-3:6379")
+    moved = [key for key in keys if ring.get_node(key) != before[key]]
+
+    assert all(before[key] == "redis-3:6379" for key in moved)
+    # Roughly a third of the keys lived on the removed node
+    assert 0.2 < len(moved) / len(keys) < 0.45
+
+
+def test_cache_works_across_nodes(monkeypatch, make_request):
+    servers = {node: fakeredis.FakeServer() for node in NODES}
+    redis = ShardedRedis(
+        {
+            node: fakeredis.FakeAsyncRedis(server=server)
+            for node, server in servers.items()
+        }
+    )
+    sync_redis = ShardedRedis(
+        {node: fakeredis.FakeRedis(server=server) for node, server in servers.items()},
+        is_async=False,
+    )
+
+    async def get_fake_redis():
+        return redis
+
+    monkeypatch.setattr(redis_module, "get_redis", get_fake_redis)
+
+    @cache_response(expiry=60, tags=["todo:list"])
+    async def get_todo(request: Request, id: int):
+        return {"id": id}
+
+    async def warm():
+        for id in range(30):
+            await get_todo(make_request(f"/todo/{id}"), id=id)
+
+    asyncio.run(warm())
+
+    nodes_used = [
+        node
+        for node, server in servers.items()
+        if fakeredis.FakeRedis(server=server).dbsize()
+    ]
+    assert len(nodes_used) == 3
+    assert CacheInvalidator(sync_redis).invalidate("todo:list") == 30
+    assert sync_redis.exists(*(f"/todo/{id}" for id in range(30))) == 0
+
+
+def test_ping_reaches_every_node():
+    servers = [fakeredis.FakeServer() for _ in NODES]
+    redis = ShardedRedis(
+        {
+            node: fakeredis.FakeAsyncRedis(server=server)
+            for node, server in zip(NODES, servers)
+        }
+    )
+
+    assert asyncio.run(redis.ping())
+
+    # A down node that is not the primary still fails the ping
+    servers[-1].connected = False
+    with pytest.raises(ConnectionError):
+        asyncio.run(redis.ping())
@@ -0,0 +1,165 @@
+import asyncio
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, Integer, String, event, func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+from app.core import NotFoundError
+from app.database.helper import AsyncDatabaseRepository
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class ItemCreate(BaseModel):
+    name: str
+
+
+class ItemUpdate(BaseModel):
+    name: str | None = None
+
+
+def run(test):
+    """
+    Run `test(repository, statements)` against a fresh in-memory database,
+    where `statements` collects the SQL sent to it.
+    """
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                statements.clear()
+                return await test(AsyncDatabaseRepository(session, Item), statements)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def verbs(statements: list[str]) -> list[str]:
+    return [statement.split()[0] for statement in statements]
+
+
+def test_select_helpers():
+    async def test(repository, statements):
+        await repository.create_many([ItemCreate(name=name) for name in "cab"])
+        ordered = repository.select().order_by(Item.name)
+
+        return (
+            [item.name for item in await repository.all(ordered)],
+            (await repository.first(ordered)).name,
+            await repository.count(ordered),
+            await repository.count(repository.select().where(Item.name == "a")),
+        )
+
+    assert run(test) == (["a", "b", "c"], "a", 3, 1)
+
+
+def test_create_returns_server_defaults_without_select():
+    async def test(repository, statements):
+        created = await repository.create(ItemCreate(name="a"))
+        return created, verbs(statements)
+
+    created, executed = run(test)
+
+    assert created.id and created.updated_at
+    assert executed == ["INSERT"]
+
+
+def test_create_many():
+    async def test(repository, statements):
+        items = [ItemCreate(name=f"item {index}") for index in range(5)]
+        created = await repository.create_many(items, batch_size=2)
+        ids = await repository.create_many([ItemCreate(name="x")], returning=False)
+        return created, ids, await repository.count(repository.select())
+
+    created, ids, count = run(test)
+
+    assert [item.name for item in created] == [f"item {index}" for index in range(5)]
+    assert ids == [6]
+    assert count == 6
+
+
+def test_update_is_one_statement():
+    async def test(repository, statements):
+        created = await repository.create(ItemCreate(name="a"))
+        statements.clear()
+        updated = await repository.update(created.id, ItemUpdate(name="b"))
+        return updated, verbs(statements)
+
+    updated, executed = run(test)
+
+    assert updated.name == "b"
+    assert executed == ["UPDATE"]
+
+
+def test_update_missing_record():
+    async def test(repository, statements):
+        await repository.update(1, ItemUpdate(name="b"))
+
+    with pytest.raises(NotFoundError):
+        run(test)
+
+
+def test_update_multiple_by_filter():
+    async def test(repository, statements):
+        await repository.create_many([ItemCreate(name=name) for name in "aac"])
+        statements.clear()
+        updated = await repository.update_multiple_by_filter(
+            {"name": "a"}, ItemUpdate(name="b")
+        )
+        executed = verbs(statements)
+        count = await repository.update_multiple_by_filter(
+            {"name": "c"}, ItemUpdate(name="d"), returning=False
+        )
+        return updated, executed, count
+
+    updated, executed, count = run(test)
+
+    assert [item.name for item in updated] == ["b", "b"]
+    assert executed == ["UPDATE"]
+    assert count == 1
+
+
+def test_delete():
+    async def test(repository, statements):
+        created = await repository.create(ItemCreate(name="a"))
+        deleted = await repository.delete(created.id)
+        return deleted, await repository.get_one(created.id)
+
+    assert run(test) == (True, None)
+
+
+def test_delete_by_filter():
+    async def test(repository, statements):
+        await repository.create_many([ItemCreate(name=name) for name in "aac"])
+        statements.clear()
+        count = await repository.delete_by_filter({"name": "a"})
+        executed = verbs(statements)
+        deleted = await repository.delete_by_filter({"name": "c"}, returning=True)
+        return count, executed, deleted, await repository.count(repository.select())
+
+    count, executed, deleted, remaining = run(test)
+
+    assert count == 2
+    assert executed == ["DELETE"]
+    assert [item.name for item in deleted] == ["c"]
+    assert remaining == 0
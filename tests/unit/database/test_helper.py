@@ -0,0 +1,152 @@
+import pytest
+from datetime import datetime
+from pydantic import BaseModel
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    String,
+    create_engine,
+    event,
+    func,
+)
+from sqlalchemy.orm import Session, declarative_base
+from app.core import DatabaseError, NotFoundError
+from app.database.helper import DatabaseRepository, copy_text
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class ItemCreate(BaseModel):
+    name: str | None
+
+
+class ItemUpdate(BaseModel):
+    name: str | None = None
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def repository(db):
+    return DatabaseRepository(db, Item)
+
+
+def test_create_many_returns_records(repository, db):
+    items = [ItemCreate(name=f"item {index}") for index in range(25)]
+
+    created = repository.create_many(items, batch_size=10)
+
+    assert [item.name for item in created] == [item.name for item in items]
+    assert all(item.id and item.created_at for item in created)
+    assert db.query(Item).count() == 25
+
+
+def test_create_many_returns_ids(repository):
+    ids = repository.create_many(
+        [ItemCreate(name="a"), ItemCreate(name="b")], returning=False
+    )
+
+    assert ids == [1, 2]
+
+
+def test_create_many_keeps_committed_batches(repository, db):
+    items = [ItemCreate(name="a"), ItemCreate(name="b"), ItemCreate(name=None)]
+
+    with pytest.raises(DatabaseError):
+        repository.create_many(items, batch_size=2)
+
+    assert db.query(Item).count() == 2
+
+
+@pytest.fixture
+def statements(db):
+    executed = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: executed.append(statement),
+    )
+    return executed
+
+
+def test_create_returns_server_defaults_without_select(repository, statements):
+    created = repository.create(ItemCreate(name="a"))
+
+    assert created.id and created.updated_at
+    assert [s.split()[0] for s in statements] == ["INSERT"]
+
+
+def test_update_is_one_statement(repository, statements):
+    created = repository.create(ItemCreate(name="a"))
+    statements.clear()
+
+    updated = repository.update(created.id, ItemUpdate(name="b"))
+
+    assert updated.name == "b" and updated.updated_at
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+
+
+def test_update_missing_record(repository):
+    with pytest.raises(NotFoundError):
+        repository.update(1, ItemUpdate(name="b"))
+
+
+def test_update_multiple_by_filter_is_one_statement(repository, statements):
+    repository.create_many([ItemCreate(name="a"), ItemCreate(name="a")])
+    statements.clear()
+
+    updated = repository.update_multiple_by_filter({"name": "a"}, ItemUpdate(name="b"))
+
+    assert [item.name for item in updated] == ["b", "b"]
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 1
+    assert not [s for s in statements if s.startswith("SELECT")]
+
+
+def test_update_multiple_by_filter_counts_rows(repository):
+    repository.create_many([ItemCreate(name="a"), ItemCreate(name="c")])
+
+    count = repository.update_multiple_by_filter(
+        {"name": "a"}, ItemUpdate(name="b"), returning=False
+    )
+
+    assert count == 1
+
+
+def test_delete_by_filter(repository, db, statements):
+    repository.create_many([ItemCreate(name="a"), ItemCreate(name="a")])
+    statements.clear()
+
+    assert repository.delete_by_filter({"name": "a"}) == 2
+    assert [s.split()[0] for s in statements] == ["DELETE"]
+    assert db.query(Item).count() == 0
+
+
+def test_delete_by_filter_returns_rows(repository):
+    repository.create_many([ItemCreate(name="a"), ItemCreate(name="c")])
+
+    deleted = repository.delete_by_filter({"name": "c"}, returning=True)
+
+    assert [item.name for item in deleted] == ["c"]
+
+
+def test_copy_text_escapes_special_characters():
+    assert copy_text(None) == r"\N"
+    assert copy_text("a\tb\nc\\d") == r"a\tb\nc\\d"
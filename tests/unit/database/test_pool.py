@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import NullPool
+from app.core.config import AppSettings
+from app.database.pool import PoolStats, engine_options, watch_pool
+
+
+@pytest.fixture
+def stats():
+    return PoolStats()
+
+
+@pytest.fixture
+def engine(tmp_path, stats):
+    settings = AppSettings(db_pool_size=1, db_max_overflow=0, db_pool_timeout=0.05)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        **engine_options(settings, stats, is_async=False),
+    )
+    watch_pool(engine, stats)
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_are_counted(engine, stats):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert stats.to_dict(engine.pool)["checked_out"] == 1
+
+    report = stats.to_dict(engine.pool)
+    assert report["checked_out"] == 0
+    assert report["checkouts"] == 1
+    assert report["connects"] == 1
+    assert report["idle"] == 1
+    assert report["wait"]["count"] == 1
+
+
+def test_checkout_timeouts_are_counted(engine, stats):
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert stats.timeouts == 1
+    assert stats.wait.count == 2
+
+
+def test_null_pool_mode(stats):
+    options = engine_options(AppSettings(db_pool_mode="null"), stats, is_async=True)
+
+    assert issubclass(options["poolclass"], NullPool)
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+
+def test_unknown_pool_mode(stats):
+    with pytest.raises(ValueError):
+        engine_options(AppSettings(db_pool_mode="lifo"), stats, is_async=False)
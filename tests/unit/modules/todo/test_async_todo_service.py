@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from app.core import NotFoundError
+from app.modules.todo.service import AsyncTodoService
+from app.modules.todo.schema import TodoCreate, TodoPaginationParams
+from app.modules.todo.constants import TodoSeverityEnum, TodoStatusEnum
+from app.modules.todo.model import Todo
+
+
+@pytest.fixture
+def mock_repository():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_cache():
+    return AsyncMock()
+
+
+@pytest.fixture
+def todo_service(mock_repository, mock_cache):
+    return AsyncTodoService(repository=mock_repository, policy=Mock(), cache=mock_cache)
+
+
+@pytest.fixture
+def todo_details():
+    return {
+        "title": "This is a test Todo",
+        "description": "This is a test Description",
+        "severity": TodoSeverityEnum.LOW,
+        "status": TodoStatusEnum.TODO,
+    }
+
+
+def test_create(todo_service, mock_repository, mock_cache, todo_details):
+    mock_repository.create.return_value = Todo(id=1, **todo_details)
+
+    result = asyncio.run(todo_service.create(TodoCreate(**todo_details)))
+
+    assert result.id == 1
+    mock_cache.invalidate.assert_awaited_once_with("todo:list", "todo:1")
+
+
+def test_get_paginated(todo_service, mock_repository, todo_details):
+    todos = [Todo(id=i, **todo_details) for i in range(1, 11)]
+    mock_repository.get_paginated.return_value = (todos, 11, 1, 10, 2)
+
+    result = asyncio.run(todo_service.get_paginated(TodoPaginationParams()))
+
+    assert len(result.items) == 10
+    assert result.total == 11
+    assert result.has_next is True
+    assert result.has_prev is False
+
+
+def test_get_by_id_not_found(todo_service, mock_repository):
+    mock_repository.get_by_id.return_value = None
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(todo_service.get_by_id(1))
+
+
+def test_update_and_delete_invalidate_cache(
+    todo_service, mock_repository, mock_cache, todo_details
+):
+    mock_repository.get_by_id.return_value = Todo(id=1, **todo_details)
+
+    asyncio.run(todo_service.update(1, TodoCreate(**todo_details)))
+    mock_cache.invalidate.assert_awaited_with("todo:list", "todo:1")
+
+    asyncio.run(todo_service.delete(1))
+    mock_repository.delete.assert_awaited_once_with(1)
+    assert mock_cache.invalidate.await_count == 2
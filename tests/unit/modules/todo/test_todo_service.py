@@ -2,6 +2,7 @@ import json
 import pytest
 from unittest.mock import Mock
 from pydantic.json import pydantic_encoder
+from app.core import NotFoundError
 from app.modules.todo.service import TodoService
 from app.modules.todo.schema import TodoCreate, TodoPaginationParams
 from app.modules.todo.constants import (
@@ -158,6 +159,13 @@ def test_get_all(todo_service, mock_repository, todo_details):
     assert result[2].id == 3
 
 
+def test_get_by_id_not_found(todo_service, mock_repository):
+    mock_repository.get_by_id.return_value = None
+
+    with pytest.raises(NotFoundError):
+        todo_service.get_by_id(1)
+
+
 def test_update(todo_service, mock_repository, todo_response_data):
     updated_details = todo_response_data
     updated_details.severity = TodoSeverityEnum.MEDIUM
@@ -186,3 +194,20 @@ def test_delete(todo_service, mock_repository):
     # assertions
     mock_repository.delete.assert_called_once()
     assert result is None
+
+
+def test_writes_invalidate_cache(mock_repository, mock_policy, create_request_data):
+    mock_cache = Mock()
+    todo_service = TodoService(
+        repository=mock_repository, policy=mock_policy, cache=mock_cache
+    )
+
+    mock_repository.create.return_value = Todo(id=2)
+    todo_service.create(create_request_data)
+    mock_cache.invalidate.assert_called_with("todo:list", "todo:2")
+
+    todo_service.update(1, create_request_data)
+    mock_cache.invalidate.assert_called_with("todo:list", "todo:1")
+
+    todo_service.delete(1)
+    mock_cache.invalidate.assert_called_with("todo:list", "todo:1")